@@ -62,6 +62,56 @@ ROUTE_COLORS = [
 POPULATION_SIZE = 100
 MUTATION_RATE = 0.4
 PRIORITY_WEIGHT = 20
+# Cache LRU de fitness do TSP (opcional): montar a chave custa mais que avaliar a
+# linha na passada vetorizada, então só compensa com muitos tours repetidos.
+# O motor giant tour (Split caro) usa o cache sempre
+FITNESS_CACHE = False
+FITNESS_CACHE_SIZE = 20_000
+
+# Avaliação paralela de fitness (0 = todos os núcleos, 1 = serial)
+FITNESS_WORKERS = 0
+# VRP: menor fatia em paradas de rotas sujas enviada a um worker. Recalcular uma
+# parada custa ~3 µs e enviá-la ~0,6 µs, mais o custo fixo de cada chamada ao pool
+PARALLEL_MIN_VRP_STOPS = 2_000
+# TSP: menor fatia em células (linhas x cidades). Uma linha custa ~1 µs e o IPC
+# mais que isso por linha enviada, então populações usuais ficam seriais
+PARALLEL_MIN_TSP_CELLS = 4_000_000
+
+# Busca local (2-opt memético)
+LOCAL_SEARCH_NEIGHBORS = 8
+LOCAL_SEARCH_RATE = 0.1
+
+# Modo ilhas: subpopulações em processos separados com migração periódica
+ISLAND_COUNT = 4
+ISLAND_MIGRATION_INTERVAL = 10   # gerações entre migrações
+ISLAND_MIGRANTS = 2              # melhores indivíduos enviados por ilha
+ISLAND_TOPOLOGY = "ring"         # "ring" ou "random"
+
+# Modo steady-state: lotes de filhos substituem indivíduos no lugar
+STEADY_STATE_BATCH = 10              # filhos por lote
+STEADY_STATE_REPLACEMENT = "worst"   # "worst" ou "similar" (crowding por arestas)
+
+# Diversidade: distância média de arestas até o melhor (0 = convergida).
+# Abaixo do limiar por DIVERSITY_PATIENCE gerações, a fração pior da
+# população é trocada por imigrantes (None desativa o reinício)
+DIVERSITY_THRESHOLD = 0.05
+DIVERSITY_PATIENCE = 10
+DIVERSITY_RESTART_FRACTION = 0.5
+
+# População inicial semeada por heurísticas (% da população; resto aleatório)
+SEEDING_PERCENT = {
+    "nearest_neighbor": 10,
+    "greedy_edge": 2,
+    "space_filling_curve": 4,
+    "priority_nearest_neighbor": 10
+}
+
+# Critérios de parada (None = desativado; a interface roda até Q sem eles)
+TERMINATION_TIME_LIMIT = None        # segundos
+TERMINATION_MAX_EVALUATIONS = None
+TERMINATION_TARGET_FITNESS = None
+TERMINATION_WINDOW = None            # gerações para medir a melhora relativa
+TERMINATION_MIN_IMPROVEMENT = 0.001  # melhora relativa mínima na janela
 
 # =========================
 # VRP SETTINGS
@@ -69,6 +119,18 @@ PRIORITY_WEIGHT = 20
 
 VRP_GENERATIONS_PER_ROUTE = 100
 
+# "routes": evolui listas de rotas com reparo por penalidades;
+# "giant_tour": evolui uma permutação única dividida em rotas viáveis pelo Split
+VRP_ENGINE = "routes"
+
+# População inicial do motor de rotas semeada por heurísticas (% da população;
+# exige depósito). O resto segue os padrões de um veículo, metade/metade e aleatório.
+VRP_SEEDING_PERCENT = {
+    "savings": 40,
+    "sweep": 20
+}
+VRP_SAVINGS_NOISE = 0.2   # perturbação relativa das economias entre sementes
+
 # =========================
 # UI TOGGLES (DEFAULT STATE)
 # =========================
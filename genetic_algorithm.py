@@ -1,6 +1,10 @@
 import random
 import math
-from typing import Tuple, List, Dict
+import time
+import numpy as np
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Tuple, List, Dict, Optional, NamedTuple
 
 # =========================
 # CONSTANTS
@@ -35,19 +39,72 @@ def generate_random_population(cities_locations: List[Tuple[int, int]],
     return population
 
 
+def generate_population_matrix(num_cities: int,
+                               population_size: int,
+                               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Gera população inicial aleatória codificada por índices de cidade.
+    Cada linha da matriz (population_size x num_cities) é uma permutação.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    keys = rng.random((population_size, num_cities))
+    return np.argsort(keys, axis=1).astype(np.intp)
+
+
+# =========================
+# ENCODING
+# =========================
+
+def encode_tour(route: List[Tuple[int, int]],
+                coord_index: Dict[Tuple[int, int], int]) -> np.ndarray:
+    """
+    Converte uma rota de coordenadas em tour de índices de cidade.
+    """
+    return np.fromiter((coord_index[coord] for coord in route), dtype=np.intp, count=len(route))
+
+
+def decode_tour(tour, coords: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Converte um tour de índices em rota de coordenadas (renderização/exportação).
+    """
+    return [coords[i] for i in tour]
+
+
+def decode_population(population: np.ndarray,
+                      coords: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+    """
+    Converte as linhas de uma matriz de população em rotas de coordenadas.
+    """
+    return [decode_tour(tour, coords) for tour in population]
+
+
 # =========================
 # DISTANCE CALCULATION
 # =========================
 
 def calculate_route_distance(route: List[Tuple[int, int]], 
                             coord_to_city: Dict[Tuple[int, int], str],
-                            distance_lookup: Dict[Tuple[str, str], float]) -> float:
+                            distance_lookup: Dict[Tuple[str, str], float],
+                            distance_matrix: Optional[np.ndarray] = None,
+                            city_index: Optional[Dict[str, int]] = None) -> float:
     """
     Calcula distância total da rota usando distâncias REAIS (km).
+    Com distance_matrix e city_index (de load_all_data) usa acesso por índice
+    em vez de consultar o dicionário par a par. distance_matrix pode ser a
+    matriz NumPy ou suas linhas como listas (matriz.tolist()), mais rápidas
+    para as rotas curtas do VRP.
     """
     if len(route) < 2:
         return 0.0
     
+    if distance_matrix is not None and city_index is not None:
+        idx = [city_index[coord_to_city[coord]] for coord in route]
+        if isinstance(distance_matrix, np.ndarray):
+            return float(distance_matrix[idx, idx[1:] + idx[:1]].sum())
+        return float(sum(distance_matrix[a][b] for a, b in zip(idx, idx[1:] + idx[:1])))
+    
     total_distance = 0.0
     
     for i in range(len(route)):
@@ -64,6 +121,18 @@ def calculate_route_distance(route: List[Tuple[int, int]],
     return total_distance
 
 
+def calculate_tour_distance(tour, distance_matrix: np.ndarray) -> float:
+    """
+    Calcula distância total de um tour codificado por índices de cidade.
+    Usa a matriz densa de load_all_data (um gather por aresta, sem dicionários).
+    """
+    tour = np.asarray(tour, dtype=np.intp)
+    if tour.size < 2:
+        return 0.0
+    
+    return float(distance_matrix[tour, np.roll(tour, -1)].sum())
+
+
 # =========================
 # ROUTE WEIGHT
 # =========================
@@ -85,6 +154,13 @@ def calculate_route_weight(route: List[Tuple[int, int]],
     return total_weight
 
 
+def calculate_tour_weight(tour, city_weights: np.ndarray) -> float:
+    """
+    Calcula peso total de um tour de índices usando o peso pré-calculado por cidade.
+    """
+    return float(city_weights[np.asarray(tour, dtype=np.intp)].sum())
+
+
 # =========================
 # PRIORITY PENALTY
 # =========================
@@ -116,6 +192,21 @@ def calculate_priority_penalty(route: List[Tuple[int, int]],
     return penalty
 
 
+def calculate_tour_priority_penalty(tour, city_priority_weights: np.ndarray) -> float:
+    """
+    Penalidade por prioridade de um tour de índices em O(n).
+    city_priority_weights[c] é a soma de PRIORITY_WEIGHTS das entregas da cidade c.
+    """
+    tour = np.asarray(tour, dtype=np.intp)
+    route_size = tour.size
+    
+    if route_size == 0:
+        return 0.0
+    
+    lateness = np.arange(route_size, dtype=np.float64) / route_size
+    return float(city_priority_weights[tour] @ lateness)
+
+
 # =========================
 # VEHICLE FEASIBILITY
 # =========================
@@ -218,92 +309,638 @@ def calculate_fitness(route: List[Tuple[int, int]],
     return fitness
 
 
+# =========================
+# INDEX-ENCODED FITNESS
+# =========================
+
+@dataclass
+class FitnessContext:
+    """
+    Dados pré-calculados para avaliar tours codificados por índices de cidade.
+    """
+    distance_matrix: np.ndarray
+    city_weights: np.ndarray
+    city_priority_weights: np.ndarray
+    vehicles: List
+    priority_weight: float = 1.0
+    distance_weight: float = 1.0
+    city_min_priority: Optional[np.ndarray] = None
+    vehicle_max_weight: np.ndarray = field(init=False, repr=False)
+    vehicle_max_distance: np.ndarray = field(init=False, repr=False)
+    total_weight: float = field(init=False, repr=False)
+    vehicle_limits: List[Tuple[float, float]] = field(init=False, repr=False)
+    min_vehicle_limits: Tuple[float, float] = field(init=False, repr=False)
+    _distance_rows: Optional[List[List[float]]] = field(init=False, repr=False, default=None)
+    
+    def __post_init__(self):
+        self.vehicle_max_weight = np.array([v.max_weight for v in self.vehicles], dtype=np.float64)
+        self.vehicle_max_distance = np.array([v.max_distance for v in self.vehicles], dtype=np.float64)
+        # Mesmos limites em floats Python para a avaliação escalar (deltas)
+        self.vehicle_limits = [(float(v.max_weight), float(v.max_distance)) for v in self.vehicles]
+        self.min_vehicle_limits = (
+            min(limit[0] for limit in self.vehicle_limits),
+            min(limit[1] for limit in self.vehicle_limits)
+        )
+        # Peso de um tour completo não depende da ordem (invariante à permutação)
+        self.total_weight = float(self.city_weights.sum())
+    
+    def distance_rows(self) -> List[List[float]]:
+        """
+        Matriz de distâncias como listas Python, criada na primeira chamada.
+        Laços escalares da busca local leem daqui: indexar arrays NumPy
+        elemento a elemento custa mais que o próprio cálculo.
+        """
+        if self._distance_rows is None:
+            self._distance_rows = self.distance_matrix.tolist()
+        return self._distance_rows
+    
+    def __getstate__(self):
+        # As listas são recriadas sob demanda; não vão para processos de trabalho
+        state = self.__dict__.copy()
+        state['_distance_rows'] = None
+        return state
+
+
+def build_fitness_context(data: Dict,
+                          priority_weight: float = 1.0,
+                          distance_weight: float = 1.0) -> FitnessContext:
+    """
+    Monta o FitnessContext a partir do dicionário de load_all_data.
+    """
+    return FitnessContext(
+        distance_matrix=data['distance_matrix'],
+        city_weights=data['city_weights'],
+        city_priority_weights=data['city_priority_weights'],
+        vehicles=data['vehicles'],
+        priority_weight=priority_weight,
+        distance_weight=distance_weight,
+        city_min_priority=data.get('city_min_priority')
+    )
+
+
+def combine_fitness(route_distance, route_weight, priority_cost, context: FitnessContext):
+    """
+    Combina distância, peso e prioridade no fitness final (escalares ou arrays).
+    Mesma regra de calculate_fitness/check_vehicle_feasibility.
+    """
+    route_distance = np.asarray(route_distance, dtype=np.float64)
+    route_weight = np.asarray(route_weight, dtype=np.float64)
+    
+    feasible = (
+        (route_weight[..., None] <= context.vehicle_max_weight) &
+        (route_distance[..., None] <= context.vehicle_max_distance)
+    ).any(axis=-1)
+    
+    excess_weight = np.maximum(route_weight - context.vehicle_max_weight.min(), 0.0)
+    excess_distance = np.maximum(route_distance - context.vehicle_max_distance.min(), 0.0)
+    vehicle_penalty = np.where(feasible, 0.0, excess_weight * 100 + excess_distance * 10)
+    
+    fitness = (
+        route_distance * context.distance_weight +
+        priority_cost * context.priority_weight +
+        vehicle_penalty
+    )
+    
+    return fitness + np.where(feasible, 0.0, CAPACITY_PENALTY + DISTANCE_PENALTY)
+
+
+def combine_fitness_scalar(route_distance: float, route_weight: float,
+                           priority_cost: float, context: FitnessContext) -> float:
+    """
+    combine_fitness para um único tour, sem o custo fixo de operações NumPy
+    em escalares (usada a cada movimento avaliado na busca local).
+    """
+    fitness = route_distance * context.distance_weight + priority_cost * context.priority_weight
+    
+    for max_weight, max_distance in context.vehicle_limits:
+        if route_weight <= max_weight and route_distance <= max_distance:
+            return fitness
+    
+    min_weight, min_distance = context.min_vehicle_limits
+    fitness += max(route_weight - min_weight, 0.0) * 100 + max(route_distance - min_distance, 0.0) * 10
+    
+    return fitness + CAPACITY_PENALTY + DISTANCE_PENALTY
+
+
+def calculate_population_fitness(pop_matrix: np.ndarray, context: FitnessContext) -> np.ndarray:
+    """
+    Calcula o fitness de toda a população em uma única passada vetorizada.
+    Distância via gather das arestas na matriz; prioridade via produto escalar
+    com os pesos de posição (posição / tamanho da rota).
+    """
+    pop_matrix = np.asarray(pop_matrix, dtype=np.intp)
+    route_size = pop_matrix.shape[1]
+    
+    if route_size == 0:
+        return np.zeros(pop_matrix.shape[0], dtype=np.float64)
+    
+    next_cities = np.roll(pop_matrix, -1, axis=1)
+    distances = context.distance_matrix[pop_matrix, next_cities].sum(axis=1)
+    
+    if route_size == context.city_weights.size:
+        weights = np.full(pop_matrix.shape[0], context.total_weight)
+    else:
+        weights = context.city_weights[pop_matrix].sum(axis=1)
+    
+    position_weights = np.arange(route_size, dtype=np.float64) / route_size
+    priority_costs = context.city_priority_weights[pop_matrix] @ position_weights
+    
+    return combine_fitness(distances, weights, priority_costs, context)
+
+
+class TourScore(NamedTuple):
+    """
+    Fitness de um tour e os componentes necessários para avaliação incremental.
+    """
+    fitness: float
+    distance: float
+    weight: float
+    priority: float
+
+
+def score_tour(tour, context: FitnessContext) -> TourScore:
+    """
+    Calcula fitness e componentes de um tour de índices em O(n),
+    sem percorrer entregas.
+    """
+    tour = np.asarray(tour, dtype=np.intp)
+    
+    route_distance = calculate_tour_distance(tour, context.distance_matrix)
+    if tour.size == context.city_weights.size:
+        route_weight = context.total_weight
+    else:
+        route_weight = calculate_tour_weight(tour, context.city_weights)
+    priority_cost = calculate_tour_priority_penalty(tour, context.city_priority_weights)
+    
+    fitness = float(combine_fitness(route_distance, route_weight, priority_cost, context))
+    return TourScore(fitness, route_distance, route_weight, priority_cost)
+
+
+def calculate_tour_fitness(tour, context: FitnessContext) -> float:
+    """
+    Calcula fitness de um tour de índices.
+    Mesma função objetivo de calculate_fitness.
+    """
+    return score_tour(tour, context).fitness
+
+
+def evaluate_pending(pop_matrix: np.ndarray,
+                     fitness: np.ndarray,
+                     context: FitnessContext,
+                     cache: Optional["FitnessCache"] = None,
+                     evaluator=None) -> np.ndarray:
+    """
+    Avalia apenas os indivíduos sem fitness conhecido (NaN).
+    Indivíduos inalterados (ex.: elite) mantêm o valor já calculado;
+    com cache, tours repetidos também não são reavaliados.
+    evaluator: substitui calculate_population_fitness (ex.: ParallelEvaluator).
+    """
+    fitness = np.array(fitness, dtype=np.float64)
+    pending = np.isnan(fitness)
+    evaluator = evaluator or calculate_population_fitness
+    
+    if pending.any():
+        if cache is not None:
+            fitness[pending] = cache.evaluate(pop_matrix[pending], context, evaluator)
+        else:
+            fitness[pending] = evaluator(pop_matrix[pending], context)
+    
+    return fitness
+
+
+# =========================
+# FITNESS CACHE
+# =========================
+
+def canonical_tours(pop_matrix: np.ndarray) -> np.ndarray:
+    """
+    Forma canônica de cada linha (tours cíclicos), em lote: rotaciona para
+    começar na menor cidade e escolhe o sentido cujo segundo elemento é menor.
+    """
+    pop_matrix = np.asarray(pop_matrix, dtype=np.intp)
+    size = pop_matrix.shape[1]
+    if size < 3:
+        return np.sort(pop_matrix, axis=1)
+    
+    shift = np.argmin(pop_matrix, axis=1)
+    rotated = np.take_along_axis(pop_matrix, (shift[:, None] + np.arange(size)) % size, axis=1)
+    flip = rotated[:, -1] < rotated[:, 1]
+    rotated[flip, 1:] = rotated[flip, :0:-1]
+    
+    return rotated
+
+
+def canonical_tour_key(tour) -> bytes:
+    """
+    Chave de um tour cíclico independente da cidade inicial e do sentido
+    (ver canonical_tours).
+    """
+    return canonical_tours(np.asarray(tour)[None, :])[0].tobytes()
+
+
+def tour_keys(pop_matrix: np.ndarray) -> List[bytes]:
+    """Bytes de cada linha, numa única chamada (mesmo valor de linha.tobytes())."""
+    rows = np.ascontiguousarray(pop_matrix, dtype=np.intp)
+    return rows.view(np.dtype((np.void, rows.itemsize * rows.shape[1]))).ravel().tolist()
+
+
+def is_cyclic_invariant(context: FitnessContext) -> bool:
+    """
+    Indica se o fitness depende só do ciclo (sem peso de prioridade por posição
+    e com matriz simétrica), caso em que a chave canônica pode ser usada.
+    """
+    matrix = context.distance_matrix
+    return context.priority_weight == 0 and np.allclose(matrix, matrix.T)
+
+
+class FitnessCache:
+    """
+    Cache LRU de fitness por tour, com contadores de acertos e falhas.
+    Com canonical=True a chave ignora rotação e sentido (ver canonical_tour_key);
+    só é correto quando o fitness não depende da posição das cidades.
+    """
+    def __init__(self, maxsize: int = 10_000, canonical: bool = False):
+        self.maxsize = maxsize
+        self.canonical = canonical
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def key(self, tour) -> bytes:
+        if self.canonical:
+            return canonical_tour_key(tour)
+        return np.ascontiguousarray(tour, dtype=np.intp).tobytes()
+    
+    def keys(self, pop_matrix: np.ndarray) -> List[bytes]:
+        """Chaves de todas as linhas, calculadas em lote."""
+        if self.canonical:
+            pop_matrix = canonical_tours(pop_matrix)
+        return tour_keys(pop_matrix)
+    
+    def get(self, tour) -> Optional[float]:
+        key = self.key(tour)
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, tour, value: float):
+        self._store(self.key(tour), value)
+    
+    def _store(self, key: bytes, value: float):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def evaluate(self, pop_matrix: np.ndarray, context: FitnessContext, evaluator=None) -> np.ndarray:
+        """
+        Fitness de cada linha: acertos vêm do cache; as falhas (sem repetição)
+        são avaliadas em lote com calculate_population_fitness (ou evaluator).
+        As chaves são montadas em lote; evaluate_pending só envia as linhas
+        pendentes (NaN).
+        """
+        evaluator = evaluator or calculate_population_fitness
+        fitness = np.empty(len(pop_matrix), dtype=np.float64)
+        if len(pop_matrix) == 0:
+            return fitness
+        missing = OrderedDict()
+        entries = self._entries
+        
+        for row, key in enumerate(self.keys(pop_matrix)):
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                fitness[row] = value
+            elif key in missing:
+                self.hits += 1
+                missing[key].append(row)
+            else:
+                self.misses += 1
+                missing[key] = [row]
+        
+        if missing:
+            first_rows = [rows[0] for rows in missing.values()]
+            values = evaluator(pop_matrix[first_rows], context)
+            for (key, rows), value in zip(missing.items(), values):
+                fitness[rows] = value
+                self._store(key, float(value))
+        
+        return fitness
+
+
+# =========================
+# DELTA EVALUATION
+# =========================
+
+def delta_segment_move(tour, i: int, length: int, p: int, reverse: bool,
+                       context: FitnessContext) -> Tuple[float, float]:
+    """
+    Variação (distância, prioridade) ao mover o segmento tour[i:i+length] para a
+    posição p da rota restante (sem o segmento), opcionalmente invertido.
+    Distância em O(1) (até 3 arestas removidas e 3 inseridas); prioridade em
+    O(|p - i|), pois as cidades entre a origem e o destino deslocam `length` posições.
+    Deve ser chamada antes de aplicar o movimento (ver apply_segment_move).
+    """
+    size = len(tour)
+    remaining = size - length
+    if (p == i and not reverse) or length < 1 or remaining < 2:
+        return 0.0, 0.0
+    
+    matrix = context.distance_matrix
+    segment = np.asarray(tour[i:i + length], dtype=np.intp)
+    first, last = (segment[-1], segment[0]) if reverse else (segment[0], segment[-1])
+    
+    def remaining_city(k):
+        k %= remaining
+        return tour[k] if k < i else tour[k + length]
+    
+    prev_city = tour[i - 1]
+    next_city = tour[(i + length) % size]
+    left = remaining_city(p - 1)
+    right = remaining_city(p)
+    
+    distance_delta = (
+        matrix[prev_city, next_city] + matrix[left, first] + matrix[last, right] -
+        matrix[prev_city, segment[0]] - matrix[segment[-1], next_city] - matrix[left, right]
+    )
+    if reverse and length > 1:
+        distance_delta += matrix[segment[1:], segment[:-1]].sum() - matrix[segment[:-1], segment[1:]].sum()
+    
+    priority = context.city_priority_weights
+    offsets = np.arange(length, dtype=np.float64)
+    new_positions = p + (offsets[::-1] if reverse else offsets)
+    priority_delta = priority[segment] @ (new_positions - (i + offsets))
+    
+    if p < i:
+        shifted = np.asarray(tour[p:i], dtype=np.intp)
+        priority_delta += length * priority[shifted].sum()
+    else:
+        shifted = np.asarray(tour[i + length:p + length], dtype=np.intp)
+        priority_delta -= length * priority[shifted].sum()
+    
+    return float(distance_delta), float(priority_delta / size)
+
+
+def apply_segment_move(tour, i: int, length: int, p: int, reverse: bool) -> np.ndarray:
+    """
+    Move o segmento tour[i:i+length] para a posição p da rota restante.
+    """
+    tour = np.asarray(tour, dtype=np.intp)
+    segment = tour[i:i + length]
+    if reverse:
+        segment = segment[::-1]
+    remaining = np.concatenate((tour[:i], tour[i + length:]))
+    
+    return np.concatenate((remaining[:p], segment, remaining[p:]))
+
+
+def rescore(parent_score: TourScore,
+            distance_delta: float,
+            priority_delta: float,
+            context: FitnessContext) -> TourScore:
+    """
+    Aplica uma variação ao score do pai e recalcula o fitness (penalidades de veículo).
+    """
+    route_distance = parent_score.distance + distance_delta
+    priority_cost = parent_score.priority + priority_delta
+    fitness = combine_fitness_scalar(route_distance, parent_score.weight, priority_cost, context)
+    
+    return TourScore(fitness, route_distance, parent_score.weight, priority_cost)
+
+
 # =========================
 # CROSSOVER OPERATORS
 # =========================
 
-def crossover_ox(parent1: List, parent2: List) -> List:
+def _position_map(tour: np.ndarray) -> np.ndarray:
+    """
+    Inverso da permutação: position[cidade] = índice da cidade no tour.
+    """
+    position = np.empty(tour.size, dtype=np.intp)
+    position[tour] = np.arange(tour.size, dtype=np.intp)
+    return position
+
+
+def crossover_ox(parent1: List, parent2: List) -> np.ndarray:
     """
     Order Crossover (OX)
+    Copia parent1[a:b] e preenche o resto, a partir de b, com as cidades
+    de parent2 na ordem em que aparecem. O(n) via máscara de cidades usadas.
     """
-    size = len(parent1)
+    parent1 = np.asarray(parent1, dtype=np.intp)
+    parent2 = np.asarray(parent2, dtype=np.intp)
+    size = parent1.size
     a, b = sorted(random.sample(range(size), 2))
     
-    child = [None] * size
+    child = np.empty(size, dtype=np.intp)
     child[a:b] = parent1[a:b]
     
-    idx = b
-    for gene in parent2:
-        if gene not in child:
-            if idx >= size:
-                idx = 0
-            child[idx] = gene
-            idx += 1
+    used = np.zeros(size, dtype=bool)
+    used[parent1[a:b]] = True
+    
+    child[np.r_[b:size, 0:a]] = parent2[~used[parent2]]
     
     return child
 
 
-def crossover_pmx(parent1: List, parent2: List) -> List:
+def crossover_pmx(parent1: List, parent2: List) -> np.ndarray:
     """
     Partially Mapped Crossover (PMX)
+    Usa o mapa de posições de parent2 no lugar de parent2.index: cada cadeia
+    de mapeamento é percorrida uma única vez, O(n) no total.
     """
-    size = len(parent1)
+    parent1 = np.asarray(parent1, dtype=np.intp)
+    parent2 = np.asarray(parent2, dtype=np.intp)
+    size = parent1.size
     a, b = sorted(random.sample(range(size), 2))
     
-    child = [None] * size
+    child = np.full(size, -1, dtype=np.intp)
     child[a:b] = parent1[a:b]
     
+    in_child = np.zeros(size, dtype=bool)
+    in_child[parent1[a:b]] = True
+    position2 = _position_map(parent2)
+    
     for i in range(a, b):
-        if parent2[i] not in child:
-            val = parent2[i]
-            idx = i
-            
-            while True:
-                mapped = parent1[idx]
-                idx = parent2.index(mapped)
-                if child[idx] is None:
-                    child[idx] = val
-                    break
+        val = parent2[i]
+        if in_child[val]:
+            continue
+        
+        idx = i
+        while True:
+            idx = position2[parent1[idx]]
+            if child[idx] == -1:
+                child[idx] = val
+                in_child[val] = True
+                break
     
-    for i in range(size):
-        if child[i] is None:
-            child[i] = parent2[i]
+    empty = child == -1
+    child[empty] = parent2[empty]
     
     return child
 
 
-def crossover_cx(parent1: List, parent2: List) -> List:
+def crossover_cx(parent1: List, parent2: List) -> np.ndarray:
     """
     Cycle Crossover (CX)
+    O ciclo que começa na posição 0 vem de parent1; as demais posições vêm
+    de parent2. O(n) via mapa de posições de parent1.
     """
-    size = len(parent1)
-    child = [None] * size
+    parent1 = np.asarray(parent1, dtype=np.intp)
+    parent2 = np.asarray(parent2, dtype=np.intp)
+    size = parent1.size
+    
+    child = parent2.copy()
+    position1 = _position_map(parent1)
+    
     index = 0
+    while True:
+        child[index] = parent1[index]
+        index = position1[parent2[index]]
+        if index == 0:
+            break
     
-    while None in child:
-        if child[index] is not None:
-            index += 1
-            continue
-        
-        start = index
-        while True:
-            child[index] = parent1[index]
-            val = parent2[index]
-            index = parent1.index(val)
-            if index == start:
-                break
+    return child
+
+
+def crossover_erx(parent1: List, parent2: List) -> np.ndarray:
+    """
+    Edge Recombination Crossover (ERX)
+    Monta o filho só com arestas dos pais sempre que possível: a partir da
+    cidade atual, segue para o vizinho (em algum dos pais) com menos vizinhos
+    restantes, preferindo arestas presentes nos dois pais. Só quando a
+    cidade atual não tem vizinhos livres escolhe uma cidade não visitada ao
+    acaso. Tabela de adjacência n x 4, O(n).
+    """
+    parent1 = np.asarray(parent1, dtype=np.intp)
+    parent2 = np.asarray(parent2, dtype=np.intp)
+    size = parent1.size
+    if size < 4:
+        return parent1.copy()
     
-    for i in range(size):
-        if child[i] is None:
-            child[i] = parent2[i]
+    # Até 4 vizinhos por cidade; arestas comuns aos dois pais marcadas em `shared`
+    adjacency = [[] for _ in range(size)]
+    shared = [set() for _ in range(size)]
+    for parent in (parent1.tolist(), parent2.tolist()):
+        for k, city in enumerate(parent):
+            for other in (parent[k - 1], parent[(k + 1) % size]):
+                if other in adjacency[city]:
+                    shared[city].add(other)
+                else:
+                    adjacency[city].append(other)
+    
+    # Cidades não visitadas com remoção O(1) (troca com a última)
+    unvisited = parent1.tolist()
+    slot = {city: k for k, city in enumerate(unvisited)}
+    
+    child = np.empty(size, dtype=np.intp)
+    current = int(parent1[0])
+    
+    for k in range(size):
+        child[k] = current
+        
+        last = unvisited.pop()
+        if last != current:
+            unvisited[slot[current]] = last
+            slot[last] = slot[current]
+        
+        for other in adjacency[current]:
+            adjacency[other].remove(current)
+        
+        if k == size - 1:
+            break
+        
+        candidates = adjacency[current]
+        if candidates:
+            common = [c for c in candidates if c in shared[current]]
+            pool = common or candidates
+            fewest = min(len(adjacency[c]) for c in pool)
+            current = random.choice([c for c in pool if len(adjacency[c]) == fewest])
+        else:
+            current = random.choice(unvisited)
     
     return child
 
 
+def crossover_ox_batch(parents1: np.ndarray,
+                       parents2: np.ndarray,
+                       rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Order Crossover (OX) para todos os pares de uma geração de uma só vez.
+    Mesma distribuição de filhos de crossover_ox, com operações de matriz.
+    """
+    parents1 = np.asarray(parents1, dtype=np.intp)
+    parents2 = np.asarray(parents2, dtype=np.intp)
+    num_pairs, size = parents1.shape
+    rows = np.arange(num_pairs)[:, None]
+    positions = np.arange(size)
+    
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    # Dois cortes distintos por par, como random.sample(range(size), 2)
+    first = rng.integers(0, size, num_pairs)
+    second = rng.integers(0, size - 1, num_pairs)
+    second += second >= first
+    a = np.minimum(first, second)[:, None]
+    b = np.maximum(first, second)[:, None]
+    
+    in_segment = (positions >= a) & (positions < b)
+    children = np.where(in_segment, parents1, 0)
+    
+    used = np.zeros((num_pairs, size), dtype=bool)
+    used[np.broadcast_to(rows, (num_pairs, size))[in_segment], parents1[in_segment]] = True
+    
+    # Cidades de parent2 ainda livres, na ordem original, vão para b, b+1, ... (circular)
+    keep = ~used[rows, parents2]
+    order = np.argsort(~keep, axis=1, kind="stable")
+    remaining = np.take_along_axis(parents2, order, axis=1)
+    fill_positions = (b + positions) % size
+    fill_mask = positions < (size - (b - a))
+    
+    fill_rows = np.broadcast_to(rows, (num_pairs, size))[fill_mask]
+    children[fill_rows, fill_positions[fill_mask]] = remaining[fill_mask]
+    
+    return children
+
+
+def crossover_population(parents1: np.ndarray,
+                         parents2: np.ndarray,
+                         crossover_key: str,
+                         rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Gera todos os filhos de uma geração: usa a versão em lote quando existe,
+    senão aplica o operador par a par.
+    """
+    if crossover_key in BATCH_CROSSOVER_TYPES:
+        return BATCH_CROSSOVER_TYPES[crossover_key](parents1, parents2, rng)
+    
+    crossover_fn = CROSSOVER_TYPES[crossover_key]
+    return np.array([crossover_fn(p1, p2) for p1, p2 in zip(parents1, parents2)], dtype=np.intp)
+
+
 CROSSOVER_TYPES = {
     "ox": crossover_ox,
     "pmx": crossover_pmx,
-    "cx": crossover_cx
+    "cx": crossover_cx,
+    "erx": crossover_erx
+}
+
+BATCH_CROSSOVER_TYPES = {
+    "ox": crossover_ox_batch
 }
 
 
@@ -311,11 +948,17 @@ CROSSOVER_TYPES = {
 # MUTATION OPERATORS
 # =========================
 
+def _copy_individual(individual):
+    if isinstance(individual, np.ndarray):
+        return individual.copy()
+    return individual[:]
+
+
 def mutate_swap(individual: List, probability: float) -> List:
     """
     Swap Mutation: Troca duas posições aleatórias.
     """
-    individual = individual[:]
+    individual = _copy_individual(individual)
     
     for i in range(len(individual)):
         if random.random() < probability:
@@ -329,11 +972,11 @@ def mutate_inversion(individual: List, probability: float) -> List:
     """
     Inversion Mutation: Inverte um segmento aleatório.
     """
-    individual = individual[:]
+    individual = _copy_individual(individual)
     
     if random.random() < probability:
         i, j = sorted(random.sample(range(len(individual)), 2))
-        individual[i:j] = reversed(individual[i:j])
+        individual[i:j] = individual[i:j][::-1]
     
     return individual
 
@@ -342,7 +985,7 @@ def mutate_scramble(individual: List, probability: float) -> List:
     """
     Scramble Mutation: Embaralha um segmento aleatório.
     """
-    individual = individual[:]
+    individual = _copy_individual(individual)
     
     if random.random() < probability:
         i, j = sorted(random.sample(range(len(individual)), 2))
@@ -353,64 +996,884 @@ def mutate_scramble(individual: List, probability: float) -> List:
     return individual
 
 
+def _mutate_segment_move(individual, probability: float, allow_reverse: bool):
+    child = _copy_individual(individual)
+    size = len(child)
+    
+    if size >= 4 and random.random() < probability:
+        length = random.randint(1, min(3, size - 3))
+        i = random.randint(0, size - length)
+        p = random.randint(0, size - length - 1)
+        if p >= i:
+            p += 1
+        reverse = allow_reverse and length > 1 and random.random() < 0.5
+        
+        moved = apply_segment_move(child, i, length, p, reverse)
+        child = moved if isinstance(child, np.ndarray) else moved.tolist()
+    
+    return child
+
+
+def mutate_or_opt(individual: List, probability: float) -> List:
+    """
+    Or-opt Mutation: Move um segmento de 1 a 3 cidades para outra posição.
+    """
+    return _mutate_segment_move(individual, probability, False)
+
+
+def mutate_or2opt(individual: List, probability: float) -> List:
+    """
+    Or-2opt Mutation: 3-opt restrito; move um segmento de 1 a 3 cidades para
+    outra posição, podendo inseri-lo invertido.
+    """
+    return _mutate_segment_move(individual, probability, True)
+
+
 MUTATION_TYPES = {
     "swap": mutate_swap,
     "inversion": mutate_inversion,
-    "scramble": mutate_scramble
+    "scramble": mutate_scramble,
+    "or_opt": mutate_or_opt,
+    "or2opt": mutate_or2opt
 }
 
 
 # =========================
-# SELECTION OPERATORS
+# BATCHED MUTATION (NumPy Generator)
 # =========================
 
-def selection_tournament(population: List, fitness: List, k: int = 3) -> Tuple:
+def _random_segments(rng: np.random.Generator, rows: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Tournament Selection.
+    Um par de posições distintas por linha, ordenado: [lo, hi) como em
+    sorted(random.sample(range(size), 2)).
     """
-    selected = random.sample(list(zip(population, fitness)), k)
-    selected.sort(key=lambda x: x[1])  # Ordena por fitness (menor é melhor)
-    return selected[0][0], selected[1][0]
+    a = rng.integers(0, size, rows)
+    b = rng.integers(0, size - 1, rows)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
 
 
-def selection_roulette(population: List, fitness: List) -> Tuple:
+def mutate_swap_batch(population: np.ndarray, probability: float,
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
-    Roulette Wheel Selection.
-    Converte fitness para probabilidade (menor fitness = maior chance).
+    mutate_swap para a população inteira: todas as decisões (posição sorteada
+    e parceiro da troca) vêm de duas chamadas ao Generator. As trocas são
+    aplicadas coluna a coluna, vetorizadas nas linhas, na mesma ordem do
+    operador individual. Lotes pequenos (menos linhas que colunas sorteadas,
+    ex.: steady-state) aplicam as trocas linha a linha.
     """
-    # Inverte o fitness (porque menor é melhor)
-    max_fitness = max(fitness) + 1
-    inverted_fitness = [max_fitness - f for f in fitness]
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
     
-    # Normaliza
-    total = sum(inverted_fitness)
-    if total == 0:
-        weights = [1] * len(population)
-    else:
-        weights = [f / total for f in inverted_fitness]
+    population = np.array(population, dtype=np.intp)
+    rows, size = population.shape
+    hits = rng.random((rows, size)) < probability
+    partners = rng.integers(0, size, (rows, size))
+    hit_columns = np.flatnonzero(hits.any(axis=0))
     
-    return random.choices(population, weights=weights, k=2)
+    if rows < hit_columns.size:
+        for r in range(rows):
+            tour = population[r].tolist()
+            for i, j in zip(np.flatnonzero(hits[r]).tolist(), partners[r, hits[r]].tolist()):
+                tour[i], tour[j] = tour[j], tour[i]
+            population[r] = tour
+        return population
+    
+    for i in hit_columns:
+        hit_rows = np.flatnonzero(hits[:, i])
+        j = partners[hit_rows, i]
+        population[hit_rows, i], population[hit_rows, j] = population[hit_rows, j], population[hit_rows, i]
+    
+    return population
 
 
-def selection_rank(population: List, fitness: List) -> Tuple:
+def mutate_inversion_batch(population: np.ndarray, probability: float,
+                           rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
-    Rank Selection.
+    mutate_inversion para a população inteira: cada posição k do segmento
+    [lo, hi) passa a ler de lo + hi - 1 - k (um único gather).
     """
-    ranked = sorted(zip(population, fitness), key=lambda x: x[1])
-    ranks = list(range(1, len(ranked) + 1))
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
     
-    return random.choices(
-        [r[0] for r in ranked],
-        weights=ranks,
-        k=2
-    )
+    population = np.array(population, dtype=np.intp)
+    rows, size = population.shape
+    hit = rng.random(rows) < probability
+    lo, hi = _random_segments(rng, rows, size)
+    lo, hi = lo[hit, None], hi[hit, None]
+    
+    positions = np.arange(size)
+    inside = (positions >= lo) & (positions < hi)
+    source = np.where(inside, lo + hi - 1 - positions, positions)
+    population[hit] = np.take_along_axis(population[hit], source, axis=1)
+    
+    return population
 
 
-SELECTION_TYPES = {
-    "tournament": selection_tournament,
-    "roulette": selection_roulette,
-    "rank": selection_rank
-}
+def mutate_scramble_batch(population: np.ndarray, probability: float,
+                          rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    mutate_scramble para a população inteira: fora do segmento a chave de
+    ordenação é a própria posição; dentro, uma chave aleatória em [lo, hi).
+    Um argsort por linha embaralha só o segmento.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    population = np.array(population, dtype=np.intp)
+    rows, size = population.shape
+    hit = rng.random(rows) < probability
+    lo, hi = _random_segments(rng, rows, size)
+    noise = rng.random((rows, size))
+    lo, hi, noise = lo[hit, None], hi[hit, None], noise[hit]
+    
+    positions = np.arange(size, dtype=np.float64)
+    inside = (positions >= lo) & (positions < hi)
+    keys = np.where(inside, lo + noise * (hi - lo), positions)
+    order = np.argsort(keys, axis=1, kind="stable")
+    population[hit] = np.take_along_axis(population[hit], order, axis=1)
+    
+    return population
+
+
+def _mutate_segment_move_batch(population: np.ndarray, probability: float,
+                               allow_reverse: bool,
+                               rng: Optional[np.random.Generator]) -> np.ndarray:
+    """
+    Versão em lote de _mutate_segment_move: para cada posição de saída
+    calcula a posição de origem (rota restante antes de p, segmento, resto).
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    population = np.array(population, dtype=np.intp)
+    rows, size = population.shape
+    if size < 4:
+        return population
+    
+    hit = rng.random(rows) < probability
+    length = rng.integers(1, min(3, size - 3) + 1, rows)
+    i = rng.integers(0, size - length + 1)
+    p = rng.integers(0, size - length)
+    p += p >= i
+    reverse = allow_reverse & (length > 1) & (rng.random(rows) < 0.5)
+    
+    length, i, p, reverse = length[hit, None], i[hit, None], p[hit, None], reverse[hit, None]
+    k = np.arange(size)
+    
+    offset = k - p
+    offset = np.where(reverse, length - 1 - offset, offset)
+    remaining = np.where(k < p, k, k - length)
+    source = np.where(
+        (k >= p) & (k < p + length),
+        i + offset,
+        np.where(remaining < i, remaining, remaining + length)
+    )
+    population[hit] = np.take_along_axis(population[hit], source, axis=1)
+    
+    return population
+
+
+def mutate_or_opt_batch(population: np.ndarray, probability: float,
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """mutate_or_opt para a população inteira."""
+    return _mutate_segment_move_batch(population, probability, False, rng)
+
+
+def mutate_or2opt_batch(population: np.ndarray, probability: float,
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """mutate_or2opt para a população inteira."""
+    return _mutate_segment_move_batch(population, probability, True, rng)
+
+
+BATCH_MUTATION_TYPES = {
+    "swap": mutate_swap_batch,
+    "inversion": mutate_inversion_batch,
+    "scramble": mutate_scramble_batch,
+    "or_opt": mutate_or_opt_batch,
+    "or2opt": mutate_or2opt_batch
+}
+
+
+def mutate_population(population: np.ndarray, mutation_key: str, probability: float,
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Aplica a mutação a todas as linhas: em lote quando há versão vetorizada,
+    senão indivíduo a indivíduo com MUTATION_TYPES.
+    """
+    if mutation_key in BATCH_MUTATION_TYPES:
+        return BATCH_MUTATION_TYPES[mutation_key](population, probability, rng)
+    
+    mutation_fn = MUTATION_TYPES[mutation_key]
+    return np.array([mutation_fn(child, probability) for child in population], dtype=np.intp)
+
+
+# =========================
+# ADAPTIVE OPERATOR SELECTION
+# =========================
+
+class OperatorBandit:
+    """
+    Probability matching sobre um registro de operadores.
+    Cada operador tem uma qualidade q (média móvel exponencial da recompensa
+    dos filhos que gerou) e probabilidade
+        p_min + (1 - K * p_min) * q / soma(q),
+    de modo que nenhum operador deixa de ser testado.
+    """
+    
+    def __init__(self, keys, min_probability: float = 0.05, adaptation_rate: float = 0.3):
+        self.keys = list(keys)
+        size = len(self.keys)
+        self.min_probability = min(min_probability, 1.0 / size)
+        self.adaptation_rate = adaptation_rate
+        self.quality = np.zeros(size)
+        self.probabilities = np.full(size, 1.0 / size)
+        self.usage = np.zeros(size, dtype=np.int64)
+        self.successes = np.zeros(size, dtype=np.int64)
+    
+    def draw(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        return rng.choice(len(self.keys), size=count, p=self.probabilities)
+    
+    def update(self, choices: np.ndarray, rewards: np.ndarray, successes: np.ndarray):
+        """Crédito da geração: média das recompensas de cada operador usado."""
+        used = np.bincount(choices, minlength=len(self.keys))
+        reward_sum = np.bincount(choices, weights=rewards, minlength=len(self.keys))
+        self.usage += used
+        self.successes += np.bincount(choices, weights=successes, minlength=len(self.keys)).astype(np.int64)
+        
+        active = used > 0
+        mean_reward = reward_sum[active] / used[active]
+        self.quality[active] += self.adaptation_rate * (mean_reward - self.quality[active])
+        
+        total = self.quality.sum()
+        shares = self.quality / total if total > 0 else np.full(len(self.keys), 1.0 / len(self.keys))
+        self.probabilities = self.min_probability + (1 - len(self.keys) * self.min_probability) * shares
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            key: {
+                "usage": int(self.usage[k]),
+                "success_rate": float(self.successes[k] / self.usage[k]) if self.usage[k] else 0.0,
+                "probability": float(self.probabilities[k])
+            }
+            for k, key in enumerate(self.keys)
+        }
+
+
+class AdaptiveOperators:
+    """
+    Escolhe crossover e mutação por filho entre todos os operadores de
+    CROSSOVER_TYPES e MUTATION_TYPES. Recompensa: melhora relativa do filho
+    sobre o melhor dos pais (0 se não melhorou); sucesso: filho melhor que
+    os dois pais. breed() registra as escolhas, credit() aplica o crédito
+    quando o fitness dos filhos é conhecido.
+    """
+    
+    def __init__(self, crossover_keys=None, mutation_keys=None,
+                 min_probability: float = 0.05, adaptation_rate: float = 0.3):
+        self.crossover = OperatorBandit(crossover_keys or CROSSOVER_TYPES, min_probability, adaptation_rate)
+        self.mutation = OperatorBandit(mutation_keys or MUTATION_TYPES, min_probability, adaptation_rate)
+        self._pending = None
+    
+    def breed(self, parents1: np.ndarray, parents2: np.ndarray, parent_fitness: np.ndarray,
+              mutation_rate: float, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        
+        count = len(parents1)
+        crossover_choice = self.crossover.draw(count, rng)
+        mutation_choice = self.mutation.draw(count, rng)
+        children = np.empty_like(parents1)
+        
+        for k, key in enumerate(self.crossover.keys):
+            rows = np.flatnonzero(crossover_choice == k)
+            if rows.size:
+                children[rows] = crossover_population(parents1[rows], parents2[rows], key, rng)
+        
+        for k, key in enumerate(self.mutation.keys):
+            rows = np.flatnonzero(mutation_choice == k)
+            if rows.size:
+                children[rows] = mutate_population(children[rows], key, mutation_rate, rng)
+        
+        self._pending = (crossover_choice, mutation_choice, np.asarray(parent_fitness, dtype=np.float64))
+        return children
+    
+    def credit(self, child_fitness: np.ndarray):
+        """child_fitness na mesma ordem dos filhos retornados por breed()."""
+        if self._pending is None:
+            return
+        crossover_choice, mutation_choice, parent_fitness = self._pending
+        self._pending = None
+        
+        best_parent = parent_fitness.min(axis=1)
+        rewards = np.maximum(best_parent - child_fitness, 0.0) / np.maximum(np.abs(best_parent), 1e-12)
+        successes = (child_fitness < best_parent).astype(np.float64)
+        
+        self.crossover.update(crossover_choice, rewards, successes)
+        self.mutation.update(mutation_choice, rewards, successes)
+    
+    def stats(self) -> Dict[str, Dict]:
+        return {"crossover": self.crossover.stats(), "mutation": self.mutation.stats()}
+
+
+# =========================
+# LOCAL SEARCH
+# =========================
+
+def build_neighbor_lists(distance_matrix: np.ndarray, k: int) -> np.ndarray:
+    """
+    Para cada cidade, os índices das k cidades mais próximas (ordem crescente).
+    """
+    size = distance_matrix.shape[0]
+    k = max(0, min(k, size - 1))
+    
+    masked = distance_matrix.astype(np.float64, copy=True)
+    np.fill_diagonal(masked, np.inf)
+    
+    return np.argsort(masked, axis=1, kind="stable")[:, :k]
+
+
+def two_opt(tour,
+            context: FitnessContext,
+            neighbors: np.ndarray,
+            score: Optional[TourScore] = None,
+            deadline: Optional[float] = None) -> Tuple[np.ndarray, TourScore]:
+    """
+    Busca local 2-opt restrita aos k vizinhos mais próximos, com don't-look bits.
+    Cada movimento é avaliado pelo fitness completo (distância da matriz e
+    prioridade), como em delta_segment_move, mas em O(1): somas prefixadas dos
+    pesos de prioridade e das arestas (nos dois sentidos) são refeitas só
+    quando um movimento é aplicado. O laço trabalha com listas Python.
+    deadline (time.perf_counter()) interrompe a busca com o melhor tour até ali.
+    Retorna (tour melhorado, score).
+    """
+    tour = np.array(tour, dtype=np.intp)
+    size = tour.size
+    if score is None:
+        score = score_tour(tour, context)
+    if size < 4:
+        return tour, score
+    
+    rows = context.distance_rows()
+    order = tour.tolist()
+    position = [0] * size
+    for k, c in enumerate(order):
+        position[c] = k
+    dont_look = [False] * size
+    queue = deque(order)
+    
+    matrix = context.distance_matrix
+    distance_weight = context.distance_weight
+    priority_weight = context.priority_weight
+    priority_array = np.asarray(context.city_priority_weights, dtype=np.float64)
+    offsets = np.arange(size, dtype=np.float64)
+    
+    def prefix_sums():
+        # weights[k] = Σ w (posições < k); moments[k] = Σ posição·w;
+        # forward/backward[k] = Σ arestas internas order[m] <-> order[m+1], m < k
+        current = np.array(order, dtype=np.intp)
+        w = priority_array[current]
+        sums = np.zeros((4, size + 1))
+        np.cumsum(w, out=sums[0, 1:])
+        np.cumsum(w * offsets, out=sums[1, 1:])
+        np.cumsum(matrix[current[:-1], current[1:]], out=sums[2, 1:size])
+        np.cumsum(matrix[current[1:], current[:-1]], out=sums[3, 1:size])
+        return sums.tolist()
+    
+    weights, moments, forward, backward = prefix_sums()
+    
+    while queue:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        city = queue.popleft()
+        if dont_look[city]:
+            continue
+        
+        improved = False
+        row = rows[city]
+        for other in neighbors[city].tolist():
+            i = position[city]
+            j = position[other]
+            lo, hi = (i, j) if i < j else (j, i)
+            city_other = row[other]
+            
+            # Sucessores: remove (t[lo], t[lo+1]) e (t[hi], t[hi+1]) -> inverte t[lo+1:hi+1]
+            # Predecessores: remove (t[lo-1], t[lo]) e (t[hi-1], t[hi]) -> inverte t[lo:hi]
+            candidates = []
+            if city_other < row[order[(i + 1) % size]]:
+                candidates.append((lo + 1, hi + 1))
+            if city_other < row[order[i - 1]]:
+                candidates.append((lo, hi))
+            
+            for start, end in candidates:
+                if end - start < 2 or end - start >= size - 1:
+                    continue
+                
+                first = order[start]
+                last = order[end - 1]
+                prev_city = order[start - 1]
+                next_city = order[end % size]
+                dd = (
+                    backward[end - 1] - backward[start] - forward[end - 1] + forward[start] +
+                    rows[prev_city][last] + rows[first][next_city] -
+                    rows[prev_city][first] - rows[last][next_city]
+                )
+                # Posição k vai para start + end - 1 - k
+                pd = (
+                    (start + end - 1) * (weights[end] - weights[start]) -
+                    2 * (moments[end] - moments[start])
+                ) / size
+                
+                # Sem encurtar a rota a penalidade de veículo não cai: basta o termo linear
+                if dd >= 0 and dd * distance_weight + pd * priority_weight >= -1e-9:
+                    continue
+                
+                new_score = rescore(score, dd, pd, context)
+                if new_score.fitness < score.fitness - 1e-9:
+                    order[start:end] = order[start:end][::-1]
+                    for k in range(start, end):
+                        position[order[k]] = k
+                    weights, moments, forward, backward = prefix_sums()
+                    score = new_score
+                    
+                    for endpoint in (prev_city, last, first, next_city):
+                        dont_look[endpoint] = False
+                        queue.append(endpoint)
+                    improved = True
+                    break
+            
+            if improved:
+                break
+        
+        if not improved:
+            dont_look[city] = True
+    
+    return np.array(order, dtype=np.intp), score
+
+
+def or_opt(tour,
+           context: FitnessContext,
+           neighbors: np.ndarray,
+           score: Optional[TourScore] = None,
+           allow_reverse: bool = True,
+           deadline: Optional[float] = None) -> Tuple[np.ndarray, TourScore]:
+    """
+    Busca local Or-opt: realoca segmentos de 1 a 3 cidades para junto de um dos
+    k vizinhos mais próximos da primeira cidade do segmento (com allow_reverse,
+    também invertidos, o movimento "or2opt"). Usa don't-look bits e aplica só
+    movimentos que melhoram o fitness completo. deadline como em two_opt.
+    """
+    tour = np.array(tour, dtype=np.intp)
+    size = tour.size
+    if score is None:
+        score = score_tour(tour, context)
+    if size < 5:
+        return tour, score
+    
+    position = _position_map(tour)
+    dont_look = np.zeros(size, dtype=bool)
+    queue = deque(tour.tolist())
+    orientations = (False, True) if allow_reverse else (False,)
+    
+    while queue:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        city = queue.popleft()
+        if dont_look[city]:
+            continue
+        
+        improved = False
+        for length in (1, 2, 3):
+            i = position[city]
+            if i + length > size:
+                continue
+            segment = tour[i:i + length]
+            
+            for other in neighbors[city]:
+                if position[other] >= i and position[other] < i + length:
+                    continue
+                
+                other_pos = position[other] if position[other] < i else position[other] - length
+                for p in (other_pos, other_pos + 1):
+                    if p == i:
+                        continue
+                    for reverse in orientations:
+                        if reverse and length == 1:
+                            continue
+                        
+                        dd, pd = delta_segment_move(tour, i, length, p, reverse, context)
+                        new_score = rescore(score, dd, pd, context)
+                        if new_score.fitness < score.fitness - 1e-9:
+                            moved_cities = segment.tolist()
+                            tour = apply_segment_move(tour, i, length, p, reverse)
+                            position = _position_map(tour)
+                            score = new_score
+                            
+                            touched = moved_cities + [tour[i - 1], tour[i % size], other]
+                            for endpoint in touched:
+                                dont_look[endpoint] = False
+                                queue.append(endpoint)
+                            improved = True
+                            break
+                    if improved:
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+        
+        if not improved:
+            dont_look[city] = True
+    
+    return tour, score
+
+
+def polish_tour(tour,
+                context: FitnessContext,
+                neighbors: np.ndarray,
+                score: Optional[TourScore] = None,
+                time_limit: Optional[float] = None) -> Tuple[np.ndarray, TourScore]:
+    """
+    Refinamento final: alterna 2-opt e Or-opt (com inversão) até não haver melhoria.
+    time_limit (segundos) encerra o refinamento com o melhor tour até ali.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    tour, score = two_opt(tour, context, neighbors, score, deadline=deadline)
+    
+    while True:
+        before = score.fitness
+        tour, score = or_opt(tour, context, neighbors, score, deadline=deadline)
+        tour, score = two_opt(tour, context, neighbors, score, deadline=deadline)
+        if score.fitness >= before - 1e-9:
+            return tour, score
+
+
+LOCAL_SEARCH_MODES = ("none", "offspring", "elite")
+
+
+def apply_local_search(population: np.ndarray,
+                       fitness: np.ndarray,
+                       context: FitnessContext,
+                       neighbors: np.ndarray,
+                       mode: str,
+                       rate: float = 0.2,
+                       elite_size: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Etapa memética da geração.
+    - "elite": aplica 2-opt aos elite_size primeiros (população ordenada);
+    - "offspring": aplica 2-opt a uma fração `rate` dos filhos.
+    Os indivíduos melhorados saem com fitness conhecido (não são reavaliados).
+    """
+    if mode not in ("elite", "offspring"):
+        return population, fitness
+    
+    population = population.copy()
+    fitness = np.array(fitness, dtype=np.float64)
+    
+    if mode == "elite":
+        rows = range(min(elite_size, len(population)))
+    else:
+        rows = [row for row in range(elite_size, len(population)) if random.random() < rate]
+    
+    for row in rows:
+        improved, score = two_opt(population[row], context, neighbors)
+        population[row] = improved
+        fitness[row] = score.fitness
+    
+    return population, fitness
+
+
+# =========================
+# CONSTRUCTIVE SEEDING
+# =========================
+
+def seed_nearest_neighbor(distance_matrix: np.ndarray,
+                          start: int,
+                          city_min_priority: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vizinho mais próximo a partir de `start`. Com city_min_priority, só considera
+    as cidades da prioridade mais alta ainda não visitada (P0 antes de P1...).
+    """
+    size = distance_matrix.shape[0]
+    visited = np.zeros(size, dtype=bool)
+    tour = np.empty(size, dtype=np.intp)
+    
+    current = start
+    for k in range(size):
+        tour[k] = current
+        visited[current] = True
+        if k == size - 1:
+            break
+        
+        candidates = ~visited
+        if city_min_priority is not None:
+            candidates &= city_min_priority == city_min_priority[candidates].min()
+        
+        row = np.where(candidates, distance_matrix[current], np.inf)
+        current = int(np.argmin(row))
+    
+    return tour
+
+
+def seed_greedy_edge(distance_matrix: np.ndarray) -> np.ndarray:
+    """
+    Greedy matching de arestas: adiciona as arestas mais curtas que não criam
+    grau 3 nem ciclo prematuro (union-find) e fecha o ciclo no final.
+    """
+    size = distance_matrix.shape[0]
+    if size < 3:
+        return np.arange(size, dtype=np.intp)
+    
+    rows, cols = np.triu_indices(size, k=1)
+    lengths = np.minimum(distance_matrix[rows, cols], distance_matrix[cols, rows])
+    order = np.argsort(lengths, kind="stable")
+    
+    degree = np.zeros(size, dtype=np.intp)
+    parent = list(range(size))
+    adjacency = [[] for _ in range(size)]
+    
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    added = 0
+    for edge in order:
+        a, b = int(rows[edge]), int(cols[edge])
+        if degree[a] >= 2 or degree[b] >= 2:
+            continue
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue
+        parent[root_a] = root_b
+        degree[a] += 1
+        degree[b] += 1
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+        added += 1
+        if added == size - 1:
+            break
+    
+    # Caminho hamiltoniano: percorre a partir de uma ponta (grau 1)
+    start = int(np.flatnonzero(degree == 1)[0])
+    tour = [start]
+    previous, current = -1, start
+    while len(tour) < size:
+        nxt = adjacency[current][0] if adjacency[current][0] != previous else adjacency[current][-1]
+        previous, current = current, nxt
+        tour.append(current)
+    
+    return np.array(tour, dtype=np.intp)
+
+
+def _hilbert_index(x: np.ndarray, y: np.ndarray, order: int) -> np.ndarray:
+    """
+    Índice na curva de Hilbert de pontos inteiros em uma grade 2^order x 2^order.
+    """
+    x = x.astype(np.int64).copy()
+    y = y.astype(np.int64).copy()
+    index = np.zeros_like(x)
+    
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        
+        # Rotaciona o quadrante
+        flip = ~ry & rx
+        x = np.where(flip, s - 1 - x, x)
+        y = np.where(flip, s - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    
+    return index
+
+
+def seed_space_filling_curve(city_latlng: np.ndarray, order: int = 16) -> np.ndarray:
+    """
+    Ordena as cidades pela curva de Hilbert sobre (lat, lng): cidades próximas
+    no mapa ficam próximas no tour. O(n log n).
+    """
+    latlng = np.asarray(city_latlng, dtype=np.float64)
+    low = latlng.min(axis=0)
+    span = np.maximum(latlng.max(axis=0) - low, 1e-12)
+    grid = ((latlng - low) / span * ((1 << order) - 1)).astype(np.int64)
+    
+    return np.argsort(_hilbert_index(grid[:, 0], grid[:, 1], order), kind="stable").astype(np.intp)
+
+
+SEEDING_TYPES = (
+    "nearest_neighbor",
+    "greedy_edge",
+    "space_filling_curve",
+    "priority_nearest_neighbor"
+)
+
+
+def generate_seeded_population(population_size: int,
+                               context: "FitnessContext",
+                               seeding_percent: Dict[str, float],
+                               city_latlng: Optional[np.ndarray] = None,
+                               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    População inicial com parte dos indivíduos construída por heurísticas.
+    seeding_percent: {tipo: % da população}, tipos em SEEDING_TYPES.
+    """
+    return seed_population(population_size, context.distance_matrix, seeding_percent,
+                           context.city_min_priority, city_latlng, rng)
+
+
+def seed_population(population_size: int,
+                    matrix: np.ndarray,
+                    seeding_percent: Dict[str, float],
+                    city_min_priority: Optional[np.ndarray] = None,
+                    city_latlng: Optional[np.ndarray] = None,
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Mesmo que generate_seeded_population, só com a matriz de distâncias (e a
+    menor prioridade de cada cidade para priority_nearest_neighbor).
+    Vizinho mais próximo varia a cidade inicial; as heurísticas determinísticas
+    (greedy, curva de Hilbert) variam rotação e sentido. O resto é aleatório.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    num_cities = matrix.shape[0]
+    population = generate_population_matrix(num_cities, population_size, rng)
+    if num_cities < 3:
+        return population
+    
+    row = 0
+    for kind in SEEDING_TYPES:
+        count = int(round(population_size * seeding_percent.get(kind, 0) / 100))
+        count = min(count, population_size - row)
+        if count <= 0:
+            continue
+        
+        if kind in ("nearest_neighbor", "priority_nearest_neighbor"):
+            priorities = city_min_priority if kind == "priority_nearest_neighbor" else None
+            if priorities is not None:
+                # Começa pelas cidades da prioridade mais alta
+                first_class = np.flatnonzero(priorities == priorities.min())
+                starts = rng.choice(first_class, size=count, replace=count > first_class.size)
+            else:
+                starts = rng.choice(num_cities, size=count, replace=count > num_cities)
+            
+            for start in starts:
+                population[row] = seed_nearest_neighbor(matrix, int(start), priorities)
+                row += 1
+        else:
+            if kind == "greedy_edge":
+                base = seed_greedy_edge(matrix)
+            elif city_latlng is not None:
+                base = seed_space_filling_curve(city_latlng)
+            else:
+                continue
+            
+            for k in range(count):
+                variant = base if k % 2 == 0 else base[::-1]
+                population[row] = np.roll(variant, -int(rng.integers(num_cities)) if k else 0)
+                row += 1
+    
+    return population
+
+
+# =========================
+# SELECTION OPERATORS
+# =========================
+
+class TournamentSelector:
+    """
+    Torneio sobre os índices da população; não materializa pares (indivíduo, fitness).
+    """
+    def __init__(self, fitness, k: int = 3):
+        self.fitness = np.asarray(fitness, dtype=np.float64)
+        self.k = k
+    
+    def select_pair(self) -> Tuple[int, int]:
+        contenders = random.sample(range(self.fitness.size), self.k)
+        contenders.sort(key=lambda i: self.fitness[i])  # Menor fitness é melhor
+        return contenders[0], contenders[1]
+
+
+class RouletteSelector:
+    """
+    Roleta com tabela de pesos acumulados montada uma vez por geração.
+    Cada sorteio é uma busca binária, O(log P).
+    """
+    def __init__(self, fitness):
+        fitness = np.asarray(fitness, dtype=np.float64)
+        self.size = fitness.size
+        
+        # Inverte o fitness (porque menor é melhor)
+        inverted_fitness = fitness.max() + 1 - fitness
+        if inverted_fitness.sum() == 0:
+            inverted_fitness = np.ones(self.size)
+        
+        self.cum_weights = np.cumsum(inverted_fitness).tolist()
+    
+    def select_pair(self) -> Tuple[int, int]:
+        i, j = random.choices(range(self.size), cum_weights=self.cum_weights, k=2)
+        return i, j
+
+
+class RankSelector:
+    """
+    Seleção por ranking: ordena uma vez por geração; o melhor recebe peso P
+    e o pior peso 1. Cada sorteio é O(log P).
+    """
+    def __init__(self, fitness):
+        fitness = np.asarray(fitness, dtype=np.float64)
+        self.ranked = np.argsort(fitness, kind="stable").tolist()
+        self.cum_weights = np.cumsum(np.arange(fitness.size, 0, -1)).tolist()
+    
+    def select_pair(self) -> Tuple[int, int]:
+        i, j = random.choices(self.ranked, cum_weights=self.cum_weights, k=2)
+        return i, j
+
+
+SELECTOR_TYPES = {
+    "tournament": TournamentSelector,
+    "roulette": RouletteSelector,
+    "rank": RankSelector
+}
+
+
+def selection_tournament(population: List, fitness: List, k: int = 3) -> Tuple:
+    """
+    Tournament Selection.
+    """
+    i, j = TournamentSelector(fitness, k).select_pair()
+    return population[i], population[j]
+
+
+def selection_roulette(population: List, fitness: List) -> Tuple:
+    """
+    Roulette Wheel Selection.
+    Converte fitness para probabilidade (menor fitness = maior chance).
+    Para vários sorteios na mesma geração, use RouletteSelector.
+    """
+    i, j = RouletteSelector(fitness).select_pair()
+    return population[i], population[j]
+
+
+def selection_rank(population: List, fitness: List) -> Tuple:
+    """
+    Rank Selection.
+    Para vários sorteios na mesma geração, use RankSelector.
+    """
+    i, j = RankSelector(fitness).select_pair()
+    return population[i], population[j]
+
+
+SELECTION_TYPES = {
+    "tournament": selection_tournament,
+    "roulette": selection_roulette,
+    "rank": selection_rank
+}
 
 
 # =========================
@@ -420,7 +1883,14 @@ SELECTION_TYPES = {
 def sort_population(population: List, fitness: List) -> Tuple:
     """
     Ordena população por fitness (ascendente - menor é melhor).
+    Aceita lista de indivíduos ou matriz de população (índices de cidade).
     """
+    if isinstance(population, np.ndarray):
+        order = np.argsort(np.asarray(fitness), kind="stable")
+        if isinstance(fitness, np.ndarray):
+            return population[order], fitness[order]
+        return population[order], [fitness[i] for i in order]
+    
     combined = list(zip(population, fitness))
     combined.sort(key=lambda x: x[1])
     
@@ -430,3 +1900,257 @@ def sort_population(population: List, fitness: List) -> Tuple:
     return sorted_pop, sorted_fit
 
 
+def breed_offspring(population: np.ndarray,
+                    fitness,
+                    ga_config: Dict,
+                    mutation_rate: float,
+                    count: int,
+                    rng: Optional[np.random.Generator] = None,
+                    adaptive: Optional[AdaptiveOperators] = None) -> np.ndarray:
+    """
+    Gera `count` filhos com seleção, crossover e mutação (em lote quando disponíveis).
+    Com adaptive, os operadores de cada filho são escolhidos por AdaptiveOperators
+    (crédito via adaptive.credit() depois da avaliação dos filhos).
+    """
+    # Estruturas de amostragem montadas uma única vez por chamada
+    selector = SELECTOR_TYPES[ga_config["selection_key"]](fitness)
+    pairs = np.array([selector.select_pair() for _ in range(count)], dtype=np.intp)
+    parents1 = population[pairs[:, 0]]
+    parents2 = population[pairs[:, 1]]
+    
+    if adaptive is not None:
+        fitness = np.asarray(fitness, dtype=np.float64)
+        return adaptive.breed(parents1, parents2, fitness[pairs], mutation_rate, rng)
+    
+    children = crossover_population(parents1, parents2, ga_config["crossover_key"], rng)
+    
+    mutation_key = ga_config.get("mutation_key")
+    if mutation_key in BATCH_MUTATION_TYPES:
+        return mutate_population(children, mutation_key, mutation_rate, rng)
+    
+    mutation_fn = ga_config["mutation_fn"]
+    return np.array([mutation_fn(child, mutation_rate) for child in children], dtype=np.intp)
+
+
+def breed_population(population: np.ndarray,
+                     fitness,
+                     ga_config: Dict,
+                     mutation_rate: float,
+                     elite_size: int = 1,
+                     rng: Optional[np.random.Generator] = None,
+                     adaptive: Optional[AdaptiveOperators] = None) -> np.ndarray:
+    """
+    Monta a próxima geração: mantém os elite_size primeiros (população ordenada)
+    e gera o resto com breed_offspring.
+    """
+    num_children = len(population) - elite_size
+    if num_children <= 0:
+        return population[:len(population)].copy()
+    
+    children = breed_offspring(population, fitness, ga_config, mutation_rate,
+                               num_children, rng, adaptive)
+    
+    return np.vstack((population[:elite_size], children))
+
+
+# =========================
+# STEADY-STATE
+# =========================
+
+REPLACEMENT_TYPES = ("worst", "similar")
+
+
+def successor_matrix(population: np.ndarray) -> np.ndarray:
+    """
+    succ[r, c] = cidade visitada depois de c no tour r (ciclo fechado).
+    """
+    succ = np.empty_like(population)
+    rows = np.arange(len(population))[:, None]
+    succ[rows, population] = np.roll(population, -1, axis=1)
+    return succ
+
+
+def shared_edge_counts(successors: np.ndarray, tours: np.ndarray) -> np.ndarray:
+    """
+    counts[t, r] = número de arestas (sem sentido) do tour t presentes na
+    linha r de successors (ver successor_matrix). Tours iguais compartilham
+    todas as n arestas.
+    """
+    a = np.atleast_2d(np.asarray(tours, dtype=np.intp))
+    b = np.roll(a, -1, axis=1)
+    shared = (successors[:, a] == b) | (successors[:, b] == a)
+    return shared.sum(axis=2).T
+
+
+def steady_state_step(population: np.ndarray,
+                      fitness: np.ndarray,
+                      ga_config: Dict,
+                      mutation_rate: float,
+                      context: FitnessContext,
+                      batch_size: int,
+                      replacement: str = "worst",
+                      cache: Optional[FitnessCache] = None,
+                      evaluator=None,
+                      rng: Optional[np.random.Generator] = None,
+                      adaptive: Optional[AdaptiveOperators] = None,
+                      neighbors: Optional[np.ndarray] = None,
+                      local_search_rate: float = 0.0) -> int:
+    """
+    Um passo steady-state: gera batch_size filhos, avalia só os filhos e os
+    insere no lugar (population e fitness são modificados in place; a
+    população não precisa estar ordenada).
+    - "worst": cada filho, do melhor para o pior, substitui o pior indivíduo
+      atual se for melhor que ele (filhos com fitness idêntico a um
+      indivíduo existente são tratados como duplicatas e descartados);
+    - "similar": crowding; cada filho substitui o indivíduo com mais arestas
+      em comum, se for melhor que ele.
+    O melhor indivíduo só é substituído por um filho melhor que ele.
+    Com neighbors, 2-opt é aplicado a uma fração local_search_rate dos filhos.
+    Retorna o número de substituições.
+    """
+    if replacement not in REPLACEMENT_TYPES:
+        raise ValueError(f"Substituição desconhecida: {replacement}")
+    
+    children = breed_offspring(population, fitness, ga_config, mutation_rate,
+                               batch_size, rng, adaptive)
+    child_fitness = np.full(len(children), np.nan)
+    
+    if neighbors is not None:
+        children, child_fitness = apply_local_search(
+            children, child_fitness, context, neighbors, "offspring", local_search_rate, elite_size=0
+        )
+    
+    child_fitness = evaluate_pending(children, child_fitness, context, cache, evaluator)
+    if adaptive is not None:
+        adaptive.credit(child_fitness)
+    
+    if replacement == "similar":
+        similarity = shared_edge_counts(successor_matrix(population), children)
+    replaced = 0
+    
+    for c in np.argsort(child_fitness, kind="stable"):
+        value = child_fitness[c]
+        
+        if replacement == "worst":
+            target = int(np.argmax(fitness))
+            if value >= fitness[target]:
+                break  # Filhos seguintes (ordenados) também não entram
+            if np.any(fitness == value):
+                continue
+        else:
+            target = int(np.argmax(similarity[c]))
+            if value >= fitness[target]:
+                continue
+            # A linha substituída passa a ser o filho c
+            similarity[:, target] = shared_edge_counts(successor_matrix(children[c:c + 1]), children)[:, 0]
+        
+        population[target] = children[c]
+        fitness[target] = value
+        replaced += 1
+    
+    return replaced
+
+
+# =========================
+# DIVERSITY
+# =========================
+
+def edge_distance_to(population: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """
+    Fração das arestas (sem sentido) de cada linha ausentes em `reference`:
+    0 = mesmo ciclo, 1 = nenhuma aresta em comum. O(P·n), vetorizado.
+    """
+    shared = shared_edge_counts(successor_matrix(reference[None, :]), population)[:, 0]
+    return 1.0 - shared / population.shape[1]
+
+
+def population_diversity(population: np.ndarray) -> float:
+    """
+    Distância média de arestas até population[0] (população ordenada, o melhor
+    primeiro). Perto de 0 indica população convergida para o mesmo ciclo.
+    """
+    if len(population) < 2 or population.shape[1] < 3:
+        return 0.0
+    return float(edge_distance_to(population[1:], population[0]).mean())
+
+
+def double_bridge_batch(tour: np.ndarray, count: int,
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    `count` cópias de tour, cada uma com um double-bridge aleatório
+    (A B C D -> A C B D): perturbação que 2-opt/Or-opt não desfazem facilmente.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    tour = np.asarray(tour, dtype=np.intp)
+    size = tour.size
+    if size < 8:
+        return np.array([rng.permutation(tour) for _ in range(count)], dtype=np.intp).reshape(count, size)
+    
+    cuts = np.sort(np.array([rng.choice(np.arange(1, size), 3, replace=False) for _ in range(count)]), axis=1)
+    a, b, c = cuts[:, :1], cuts[:, 1:2], cuts[:, 2:]
+    k = np.arange(size)[None, :]
+    
+    # Posição k do filho lê de: A (k < a), C (a <= k < a+c-b), B (até c), D (k >= c)
+    source = np.where(k < a, k,
+             np.where(k < a + c - b, b + k - a,
+             np.where(k < c, k - (c - b), k)))
+    return tour[source]
+
+
+def inject_immigrants(population: np.ndarray,
+                      fitness: np.ndarray,
+                      fraction: float,
+                      rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reinício parcial de uma população ordenada: a fração `fraction` pior é
+    substituída por imigrantes, metade double-bridge do melhor e metade
+    aleatórios. Os imigrantes saem com fitness NaN (avaliar com evaluate_pending).
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    count = min(int(round(len(population) * fraction)), len(population) - 1)
+    if count <= 0:
+        return population, fitness
+    
+    population = population.copy()
+    fitness = np.array(fitness, dtype=np.float64)
+    kicked = count // 2
+    
+    population[-count:] = np.vstack((
+        double_bridge_batch(population[0], kicked, rng),
+        generate_population_matrix(population.shape[1], count - kicked, rng)
+    ))
+    fitness[-count:] = np.nan
+    
+    return population, fitness
+
+
+class DiversityMonitor:
+    """
+    Acompanha population_diversity a cada geração e sinaliza um reinício
+    parcial quando ela fica abaixo de `threshold` por `patience` gerações
+    seguidas. Depois de sinalizar, a contagem recomeça. threshold=None só mede.
+    """
+    
+    def __init__(self, threshold: Optional[float], patience: int):
+        self.threshold = threshold
+        self.patience = max(1, patience)
+        self.value = None
+        self.restarts = 0
+        self._low = 0
+    
+    def update(self, population: np.ndarray) -> bool:
+        self.value = population_diversity(population)
+        if self.threshold is None:
+            return False
+        
+        self._low = self._low + 1 if self.value < self.threshold else 0
+        
+        if self._low >= self.patience:
+            self._low = 0
+            self.restarts += 1
+            return True
+        return False
@@ -0,0 +1,416 @@
+# giant_tour.py
+"""
+Motor alternativo para o VRP com codificação de "giant tour".
+
+Cada indivíduo é uma permutação de todas as cidades (o mesmo formato do TSP),
+então seleção, crossover e mutação do genetic_algorithm são reutilizados sem
+adaptação. O Split (Prins) divide o giant tour, de forma ótima e sem mudar a
+ordem, em rotas que saem do depósito e voltam a ele, respeitando max_weight e
+max_distance de cada veículo e a quantidade de veículos de cada tipo da frota.
+Todo indivíduo decodificado é viável por construção; o fitness é o custo do
+Split (mesmo total_cost e priority_score de VRPRoute, mais a penalidade por
+veículo de calculate_vrp_fitness).
+"""
+import random
+import itertools
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import POPULATION_SIZE, MUTATION_RATE, FITNESS_CACHE_SIZE, SEEDING_PERCENT
+from genetic_algorithm import (
+    MUTATION_TYPES,
+    FitnessCache,
+    evaluate_pending,
+    sort_population,
+    breed_population,
+    seed_population
+)
+from loader_resources.city_loader import build_distance_matrix
+from termination import TerminationPolicy
+
+
+# Custo fixo por rota usado em VRPRoute.total_cost
+ROUTE_FIXED_COST = 800
+# Fator por entrega usado em VRPRoute.priority_score (posição normalizada na rota)
+ROUTE_PRIORITY_FACTORS = {0: 100, 1: 30, 2: 10}
+# Fitness de tours sem partição viável (frota insuficiente para aquela ordem)
+INFEASIBLE_SPLIT_COST = 1e12
+# Limite de estados do Split (combinações de veículos usados por tipo)
+MAX_SPLIT_STATES = 4096
+# Folga numérica na comparação com os limites dos veículos
+LIMIT_TOLERANCE = 1e-9
+# Células de custo (linhas x tipos x cidades x tamanho de rota) por lote do Split
+SPLIT_BATCH_CELLS = 2_000_000
+
+
+@dataclass
+class SplitInstance:
+    """
+    Dados do Split para um conjunto de cidades (índices 0..n-1 em `coords`).
+    Veículos com os mesmos limites e custo formam um tipo; o estado do DP é
+    quantos veículos de cada tipo já foram usados (raiz mista).
+    """
+    coords: List[Tuple]
+    distance_matrix: np.ndarray
+    city_weights: np.ndarray
+    city_priority_factors: np.ndarray
+    city_min_priority: np.ndarray
+    vehicles: List
+    depot_out: Optional[np.ndarray] = None      # depósito -> cidade
+    depot_back: Optional[np.ndarray] = None     # cidade -> depósito
+    depot_coord: Optional[Tuple] = None
+    priority_weight: float = 50.0
+    route_weight: float = 0.0                   # penalidade por veículo usado
+    fleet_types: List[List] = field(init=False, repr=False)
+    type_limits: np.ndarray = field(init=False, repr=False)
+    next_state: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        groups = {}
+        for vehicle in self.vehicles:
+            key = (float(vehicle.max_weight), float(vehicle.max_distance), float(vehicle.cost_per_km))
+            groups.setdefault(key, []).append(vehicle)
+        keys = list(groups)
+        self.fleet_types = [groups[key] for key in keys]
+        # Colunas: max_weight, max_distance, cost_per_km
+        self.type_limits = np.array(keys, dtype=np.float64).reshape(-1, 3)
+
+        counts = [len(group) for group in self.fleet_types]
+        strides = np.cumprod([1] + [c + 1 for c in counts[:-1]]).astype(np.intp)
+        states = int(np.prod([c + 1 for c in counts]))
+        if states > MAX_SPLIT_STATES:
+            raise ValueError(f"Frota com {states} combinações de veículos; limite do Split é {MAX_SPLIT_STATES}")
+
+        # next_state[t, s] = estado após usar mais um veículo do tipo t (-1 se esgotado)
+        all_states = np.arange(states)
+        self.next_state = np.full((len(counts), states), -1, dtype=np.intp)
+        for t, (count, stride) in enumerate(zip(counts, strides)):
+            used = (all_states // stride) % (count + 1)
+            self.next_state[t] = np.where(used < count, all_states + stride, -1)
+
+    @property
+    def size(self) -> int:
+        return len(self.coords)
+
+    @property
+    def max_route_length(self) -> int:
+        """
+        Limite independente da ordem: nenhuma rota passa do maior max_weight da
+        frota, então nenhuma tem mais cidades do que as mais leves que cabem nele.
+        """
+        capacity = self.type_limits[:, 0].max() + LIMIT_TOLERANCE
+        fits = int(np.searchsorted(np.cumsum(np.sort(self.city_weights)), capacity, side="right"))
+        return max(1, min(self.size, fits))
+
+    def check_servable(self):
+        """ValueError se alguma cidade não cabe em nenhum veículo sozinha."""
+        single = self._segment_costs(np.arange(self.size)[None, :])[0, :, :, 0]
+        for k in range(self.size):
+            if np.isinf(single[:, k]).all():
+                raise ValueError(f"Nenhum veículo atende a cidade {k} sozinho (peso/distância)")
+
+    def _segment_costs(self, tours: np.ndarray) -> np.ndarray:
+        """
+        cost[p, t, i, d - 1]: custo da rota tours[p, i:i + d] no tipo t, para
+        d = 1.._route_length (inf se inviável ou além do fim do tour).
+        Com as somas acumuladas ao longo do tour cada segmento sai em O(1).
+        """
+        rows, n = tours.shape
+        legs = self.distance_matrix[tours[:, :-1], tours[:, 1:]]
+        along = np.zeros((rows, n))
+        np.cumsum(legs, axis=1, out=along[:, 1:])                  # along[k]: tour[0] -> tour[k]
+
+        weights = np.zeros((rows, n + 1))
+        np.cumsum(self.city_weights[tours], axis=1, out=weights[:, 1:])
+        factors = self.city_priority_factors[tours]
+        factor_sum = np.zeros((rows, n + 1))
+        np.cumsum(factors, axis=1, out=factor_sum[:, 1:])
+        factor_pos = np.zeros((rows, n + 1))
+        np.cumsum(factors * np.arange(n), axis=1, out=factor_pos[:, 1:])
+
+        length = self._route_length(weights, along)
+        i = np.arange(n)[:, None]
+        span = np.arange(1, length + 1)[None, :]
+        j = np.minimum(i + span, n)
+        valid = (i + span <= n)[None, None]
+        last = j - 1
+
+        inner = along[:, last] - along[:, i]
+        if self.depot_out is not None:
+            distance = self.depot_out[tours[:, i]] + inner + self.depot_back[tours[:, last]]
+        else:
+            # Sem depósito a rota fecha o ciclo (como calculate_route_distance)
+            distance = inner + self.distance_matrix[tours[:, last], tours[:, i]]
+        weight = weights[:, j] - weights[:, i]
+        # priority_score: soma de fator * posição / max(1, tamanho - 1)
+        priority = ((factor_pos[:, j] - factor_pos[:, i])
+                    - i * (factor_sum[:, j] - factor_sum[:, i])) / np.maximum(1, span - 1)
+
+        limits = self.type_limits[None, :, :, None, None]
+        distance = distance[:, None]
+        feasible = (
+            valid &
+            (weight[:, None] <= limits[:, :, 0] + LIMIT_TOLERANCE) &
+            (distance <= limits[:, :, 1] + LIMIT_TOLERANCE)
+        )
+        route_cost = (distance * limits[:, :, 2] + ROUTE_FIXED_COST + self.route_weight
+                      + self.priority_weight * priority[:, None])
+        return np.where(feasible, route_cost, np.inf)
+
+    def _route_length(self, weights: np.ndarray, along: np.ndarray) -> int:
+        """
+        Corte do Split (Prins): a rota iniciada em i para na cidade em que o peso
+        acumulado passa do maior max_weight da frota ou o trecho percorrido passa
+        do maior max_distance. Retorna o maior tamanho entre os inícios do lote.
+        """
+        capacity, reach = self.type_limits[:, :2].max(axis=0) + LIMIT_TOLERANCE
+        starts = np.arange(along.shape[1])
+        longest = 1
+        for weight, distance in zip(weights, along):
+            by_weight = np.searchsorted(weight, weight[:-1] + capacity, side="right") - 1 - starts
+            by_distance = np.searchsorted(distance, distance + reach, side="right") - starts
+            longest = max(longest, int(np.minimum(by_weight, by_distance).max()))
+        return min(longest, self.max_route_length)
+
+    def split_population(self, tours: np.ndarray) -> np.ndarray:
+        """Custo do Split de cada linha de `tours`, com o DP vetorizado entre as linhas."""
+        tours = np.asarray(tours, dtype=np.intp)
+        cells = len(self.fleet_types) * tours.shape[1] * self.max_route_length
+        batch = max(1, SPLIT_BATCH_CELLS // max(1, cells))
+        totals = np.concatenate([
+            self._split_dp(self._segment_costs(tours[k:k + batch]))[0][:, -1].min(axis=1)
+            for k in range(0, len(tours), batch)
+        ]) if len(tours) else np.empty(0)
+        return np.where(np.isfinite(totals), totals, INFEASIBLE_SPLIT_COST)
+
+    def split(self, tour, with_routes: bool = False):
+        """
+        Partição ótima de `tour` em rotas consecutivas.
+        Retorna o custo (INFEASIBLE_SPLIT_COST se não houver partição viável)
+        e, com with_routes, a lista [(início, fim, tipo)] das rotas.
+        """
+        tour = np.asarray(tour, dtype=np.intp)[None, :]
+        if not with_routes:
+            return float(self.split_population(tour)[0])
+
+        best, pred = self._split_dp(self._segment_costs(tour), track=True)
+        final_state = int(np.argmin(best[0, -1]))
+        total = float(best[0, -1, final_state])
+        if not np.isfinite(total):
+            return INFEASIBLE_SPLIT_COST, []
+
+        routes = []
+        end, state = tour.shape[1], final_state
+        while end > 0:
+            start, previous, kind = (int(v) for v in pred[end, state])
+            routes.append((start, end, kind))
+            end, state = start, previous
+        routes.reverse()
+        return total, routes
+
+    def _split_dp(self, cost: np.ndarray, track: bool = False):
+        """
+        DP do Split sobre best[p, j, estado]. Cada início i só estende rotas até
+        max_route_length cidades. Com track (uma linha), pred[j, estado] guarda
+        (início, estado anterior, tipo) da última rota.
+        """
+        rows, kinds, n, length = cost.shape
+        best = np.full((rows, n + 1, self.next_state.shape[1]), np.inf)
+        best[:, 0, 0] = 0.0
+        pred = np.full((n + 1, self.next_state.shape[1], 3), -1, dtype=np.intp) if track else None
+
+        for i in range(n):
+            live = np.isfinite(best[:, i]).any(axis=0)
+            if not live.any():
+                continue
+            stop = min(n, i + length)
+
+            for t in range(kinds):
+                sources = np.flatnonzero(live & (self.next_state[t] >= 0))
+                if sources.size == 0:
+                    continue
+                targets = self.next_state[t, sources]
+
+                candidate = best[:, i][:, None, sources] + cost[:, t, i, :stop - i, None]
+                current = best[:, i + 1:stop + 1, targets]
+                better = candidate < current
+                best[:, i + 1:stop + 1, targets] = np.where(better, candidate, current)
+                if track:
+                    ends, cols = np.nonzero(better[0])
+                    pred[i + 1 + ends, targets[cols]] = np.column_stack(
+                        (np.full(ends.size, i), sources[cols], np.full(ends.size, t))
+                    )
+        return best, pred
+
+
+def build_split_instance(cities_coords, coord_to_city, deliveries_by_city,
+                         distance_lookup, vehicles, depot_coord=None,
+                         priority_weight: float = 50.0,
+                         route_weight: float = 0.0) -> SplitInstance:
+    """
+    Monta a SplitInstance a partir dos mesmos argumentos de solve_vrp.
+    As distâncias seguem calculate_route_distance (ida ou volta do lookup).
+    """
+    names = [coord_to_city[coord] for coord in cities_coords]
+    with_depot = depot_coord is not None
+    if with_depot:
+        names.append(coord_to_city[depot_coord])
+    matrix, _ = build_distance_matrix(names, distance_lookup)
+
+    size = len(cities_coords)
+    weights = np.zeros(size)
+    factors = np.zeros(size)
+    min_priority = np.full(size, 2, dtype=np.int64)
+    for k, name in enumerate(names[:size]):
+        for delivery in deliveries_by_city.get(name, []):
+            weights[k] += delivery.total_weight
+            factors[k] += ROUTE_PRIORITY_FACTORS.get(delivery.priority, 10)
+            min_priority[k] = min(min_priority[k], delivery.priority)
+
+    return SplitInstance(
+        coords=list(cities_coords),
+        distance_matrix=np.ascontiguousarray(matrix[:size, :size]),
+        city_weights=weights,
+        city_priority_factors=factors,
+        city_min_priority=min_priority,
+        vehicles=list(vehicles),
+        depot_out=matrix[size, :size].copy() if with_depot else None,
+        depot_back=matrix[:size, size].copy() if with_depot else None,
+        depot_coord=depot_coord,
+        priority_weight=priority_weight,
+        route_weight=route_weight
+    )
+
+
+def evaluate_giant_tours(pop_matrix: np.ndarray, instance: SplitInstance) -> np.ndarray:
+    """Custo do Split de cada linha (mesma assinatura de calculate_population_fitness)."""
+    return instance.split_population(pop_matrix)
+
+
+def decode_giant_tour(tour, instance: SplitInstance):
+    """
+    Giant tour -> lista de VRPRoute com estatísticas calculadas. Os veículos
+    de cada tipo são atribuídos na ordem da frota.
+    """
+    from vrp_solver import VRPRoute
+
+    _, routes = instance.split(tour, with_routes=True)
+    next_vehicle = [0] * len(instance.fleet_types)
+    solution = []
+    for start, end, kind in routes:
+        vehicle = instance.fleet_types[kind][next_vehicle[kind]]
+        next_vehicle[kind] += 1
+        coords = [instance.coords[c] for c in tour[start:end]]
+        solution.append(VRPRoute(vehicle, coords, instance.depot_coord))
+    return solution
+
+
+# =========================
+# MOTOR
+# =========================
+
+def solve_vrp_giant_tour(cities_coords, coord_to_city, deliveries_by_city,
+                         distance_lookup, vehicles, ga_config,
+                         depot_city=None, generations_per_route=150,
+                         termination=None, on_improvement=None,
+                         seed: Optional[int] = None,
+                         distance_matrix=None, city_index=None):
+    """
+    Mesma interface e retorno de solve_vrp, evoluindo giant tours com os
+    operadores do TSP escolhidos em ga_config.
+    """
+    from vrp_solver import VRPOptions, print_final_report, route_distance_matrix
+
+    if termination is None:
+        termination = TerminationPolicy.from_config(max_generations=generations_per_route)
+    termination.start()
+
+    print("\n🚀 VRP (GIANT TOUR + SPLIT)")
+    print(f"📍 Cidades: {len(cities_coords)}")
+    print(f"🚛 Veículos: {len(vehicles)}")
+
+    depot_coord = None
+    if depot_city:
+        for coord, city in coord_to_city.items():
+            if city == depot_city:
+                depot_coord = coord
+                break
+        print(f"🏭 Depósito: {depot_city}")
+    distance_matrix, city_index = route_distance_matrix(
+        cities_coords, depot_coord, coord_to_city, distance_lookup, distance_matrix, city_index
+    )
+
+    # Como em solve_vrp, a cidade do depósito continua sendo atendida (distância 0)
+    customers = list(cities_coords)
+    # Mesmos pesos de calculate_vrp_fitness para prioridade e veículos usados
+    weights = VRPOptions().WEIGHTS
+    instance = build_split_instance(
+        customers, coord_to_city, deliveries_by_city, distance_lookup, vehicles,
+        depot_coord, weights['priority'], weights['vehicle_count']
+    )
+    instance.check_servable()
+
+    ga_config = dict(ga_config)
+    ga_config.setdefault("mutation_fn", MUTATION_TYPES[ga_config["mutation_key"]])
+    if seed is not None:
+        random.seed(seed)
+    rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+    cache = FitnessCache(FITNESS_CACHE_SIZE)
+
+    # Coordenadas de tela servem de plano para a curva de Hilbert
+    population = seed_population(
+        POPULATION_SIZE, instance.distance_matrix, SEEDING_PERCENT,
+        instance.city_min_priority, np.array(customers, dtype=np.float64), rng
+    )
+    fitness = np.full(POPULATION_SIZE, np.nan)
+
+    best_tour = None
+    best_fitness = float('inf')
+    best_solution = []
+    cost_history = []
+    distance_history = []
+    evaluations = 0
+
+    for gen in itertools.count():
+        if gen > 0:
+            population = breed_population(population, fitness, ga_config, MUTATION_RATE, rng=rng)
+            fitness = np.concatenate(([fitness[0]], np.full(len(population) - 1, np.nan)))
+
+        evaluations += int(np.isnan(fitness).sum())
+        fitness = evaluate_pending(population, fitness, instance, cache, evaluate_giant_tours)
+        population, fitness = sort_population(population, fitness)
+
+        if fitness[0] < best_fitness:
+            best_fitness = float(fitness[0])
+            best_tour = population[0].copy()
+            best_solution = decode_giant_tour(best_tour, instance)
+            for route in best_solution:
+                route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup,
+                                      distance_matrix, city_index)
+
+            if gen % 10 == 0 or gen < 20:
+                print(f"Gen {gen:3d} | Fit: {best_fitness:8.0f} | V: {len(best_solution)} | C: {len(customers)}")
+            if on_improvement is not None:
+                on_improvement(best_solution, best_fitness, gen)
+
+        cost_history.append(sum(r.total_cost for r in best_solution))
+        distance_history.append(sum(r.total_distance for r in best_solution))
+
+        if termination.should_stop(gen + 1, evaluations, best_fitness):
+            print(f"🏁 Parando na geração {gen}: {termination.reason}")
+            break
+
+    if best_fitness >= INFEASIBLE_SPLIT_COST:
+        print("⚠️  Nenhuma partição viável encontrada para a frota disponível")
+        best_solution = []
+
+    print(f"   Cache de fitness: {cache.hit_rate:.0%} de acertos")
+    print_final_report(best_solution, customers, coord_to_city, deliveries_by_city)
+
+    return best_solution, {
+        "cost_history": cost_history,
+        "distance_history": distance_history,
+        "attempts": []
+    }
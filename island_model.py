@@ -0,0 +1,338 @@
+# island_model.py
+"""
+Modelo de ilhas para o TSP.
+
+N subpopulações evoluem em processos separados, cada uma com sua combinação
+de operadores (seleção/crossover/mutação). A cada `interval` gerações as
+ilhas trocam seus melhores indivíduos seguindo uma topologia em anel ou
+aleatória. A matriz de distâncias e os agregados ficam em memória
+compartilhada (parallel_fitness.SharedArrays).
+"""
+import random
+import multiprocessing as mp
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from genetic_algorithm import (
+    FitnessContext,
+    FitnessCache,
+    is_cyclic_invariant,
+    generate_seeded_population,
+    evaluate_pending,
+    sort_population,
+    breed_population,
+    build_neighbor_lists,
+    apply_local_search,
+    MUTATION_TYPES,
+    SELECTION_TYPES,
+    CROSSOVER_TYPES
+)
+from parallel_fitness import SharedArrays, attach_arrays, SHARED_CONTEXT_ARRAYS
+from config import (
+    POPULATION_SIZE,
+    MUTATION_RATE,
+    FITNESS_CACHE,
+    FITNESS_CACHE_SIZE,
+    LOCAL_SEARCH_NEIGHBORS,
+    LOCAL_SEARCH_RATE,
+    SEEDING_PERCENT,
+    ISLAND_COUNT,
+    ISLAND_MIGRATION_INTERVAL,
+    ISLAND_MIGRANTS,
+    ISLAND_TOPOLOGY
+)
+
+
+ISLAND_TOPOLOGIES = ("ring", "random")
+
+
+def island_configs(base_config: Dict, count: int) -> List[Dict]:
+    """
+    Combinações de operadores por ilha: a ilha 0 usa a configuração escolhida
+    no menu; as demais deslocam seleção, crossover e mutação em uma posição
+    cada, percorrendo combinações diferentes.
+    """
+    selections = list(SELECTION_TYPES)
+    crossovers = list(CROSSOVER_TYPES)
+    mutations = list(MUTATION_TYPES)
+
+    base_selection = selections.index(base_config.get("selection_key", selections[0]))
+    base_crossover = crossovers.index(base_config.get("crossover_key", crossovers[0]))
+    base_mutation = mutations.index(base_config.get("mutation_key", mutations[0]))
+
+    configs = []
+    for k in range(count):
+        configs.append({
+            "selection_key": selections[(base_selection + k) % len(selections)],
+            "crossover_key": crossovers[(base_crossover + k) % len(crossovers)],
+            "mutation_key": mutations[(base_mutation + k) % len(mutations)],
+            "local_search": base_config.get("local_search", "none")
+        })
+
+    return configs
+
+
+def migration_targets(count: int, topology: str, rng: np.random.Generator) -> List[int]:
+    """
+    targets[i] = ilha que recebe os migrantes da ilha i.
+    "ring": i -> i+1; "random": permutação sem pontos fixos.
+    """
+    if count <= 1:
+        return list(range(count))
+
+    if topology == "ring":
+        return [(i + 1) % count for i in range(count)]
+
+    if topology == "random":
+        # Ciclo aleatório: cada ilha envia e recebe exatamente uma vez
+        order = rng.permutation(count)
+        targets = [0] * count
+        for k in range(count):
+            targets[order[k]] = int(order[(k + 1) % count])
+        return targets
+
+    raise ValueError(f"Topologia desconhecida: {topology}")
+
+
+# =========================
+# ILHA
+# =========================
+
+class Island:
+    """
+    Uma subpopulação com seu próprio cache (com FITNESS_CACHE), RNG e operadores.
+    Roda dentro de um processo worker ou, no fallback serial, no principal.
+    """
+
+    def __init__(self, context: FitnessContext, ga_config: Dict,
+                 population_size: int = POPULATION_SIZE,
+                 seeding: Optional[Dict] = None,
+                 city_latlng: Optional[np.ndarray] = None,
+                 seed: Optional[int] = None,
+                 mutation_rate: float = MUTATION_RATE):
+        self.context = context
+        self.rng = np.random.default_rng(seed)
+        self.mutation_rate = mutation_rate
+        self.ga_config = dict(ga_config, mutation_fn=MUTATION_TYPES[ga_config["mutation_key"]])
+        self.local_search = ga_config.get("local_search", "none")
+        self.cache = None
+        if FITNESS_CACHE:
+            self.cache = FitnessCache(FITNESS_CACHE_SIZE, canonical=is_cyclic_invariant(context))
+
+        self.neighbors = None
+        if self.local_search != "none":
+            self.neighbors = build_neighbor_lists(context.distance_matrix, LOCAL_SEARCH_NEIGHBORS)
+
+        self.population = generate_seeded_population(
+            population_size, context, seeding or {}, city_latlng, self.rng
+        )
+        self.fitness = np.full(population_size, np.nan)
+        self._evaluate()
+
+    def _evaluate(self):
+        self.fitness = evaluate_pending(self.population, self.fitness, self.context, self.cache)
+        self.population, self.fitness = sort_population(self.population, self.fitness)
+
+    def receive(self, migrants: np.ndarray, migrant_fitness: np.ndarray):
+        """Migrantes substituem os piores indivíduos (fitness já conhecido)."""
+        count = min(len(migrants), len(self.population) - 1)
+        if count <= 0:
+            return
+        self.population[-count:] = migrants[:count]
+        self.fitness[-count:] = migrant_fitness[:count]
+        self.population, self.fitness = sort_population(self.population, self.fitness)
+
+    def evolve(self, generations: int):
+        for _ in range(generations):
+            if self.local_search == "elite":
+                self.population, self.fitness = apply_local_search(
+                    self.population, self.fitness, self.context, self.neighbors, "elite"
+                )
+
+            self.population = breed_population(
+                self.population, self.fitness, self.ga_config, self.mutation_rate, rng=self.rng
+            )
+            self.fitness = np.concatenate(([self.fitness[0]], np.full(len(self.population) - 1, np.nan)))
+
+            if self.local_search == "offspring":
+                self.population, self.fitness = apply_local_search(
+                    self.population, self.fitness, self.context, self.neighbors,
+                    "offspring", LOCAL_SEARCH_RATE
+                )
+
+            self._evaluate()
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """População e fitness atuais (ordenados), copiados."""
+        return self.population.copy(), self.fitness.copy()
+
+
+def _island_worker(conn, spec, vehicles, priority_weight, distance_weight,
+                   ga_config, population_size, seeding, city_latlng, seed, mutation_rate):
+    """
+    Processo de uma ilha. Protocolo: envia a população inicial; depois recebe
+    (migrantes, fitness, gerações) e responde com a população ordenada; None encerra.
+    """
+    # Mutações usam o módulo random: cada ilha precisa da sua própria sequência
+    random.seed(seed)
+
+    arrays, blocks = attach_arrays(spec)
+    context = FitnessContext(
+        vehicles=vehicles,
+        priority_weight=priority_weight,
+        distance_weight=distance_weight,
+        **{name: arrays.get(name) for name in SHARED_CONTEXT_ARRAYS}
+    )
+    island = Island(context, ga_config, population_size, seeding, city_latlng, seed, mutation_rate)
+
+    conn.send(island.snapshot())
+
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        migrants, migrant_fitness, generations = message
+        if migrants is not None:
+            island.receive(migrants, migrant_fitness)
+        island.evolve(generations)
+        conn.send(island.snapshot())
+
+    conn.close()
+    for block in blocks:
+        block.close()
+
+
+# =========================
+# COORDENADOR
+# =========================
+
+class IslandModel:
+    """
+    Coordena as ilhas: cada step() roda `interval` gerações em todas as
+    ilhas em paralelo e faz uma rodada de migração. population/fitness
+    agregam as populações de todas as ilhas (ordenadas) após cada rodada.
+    """
+
+    def __init__(self, context: FitnessContext, ga_config: Dict,
+                 islands: int = ISLAND_COUNT,
+                 interval: int = ISLAND_MIGRATION_INTERVAL,
+                 migrants: int = ISLAND_MIGRANTS,
+                 topology: str = ISLAND_TOPOLOGY,
+                 population_size: int = POPULATION_SIZE,
+                 seeding: Optional[Dict] = None,
+                 city_latlng: Optional[np.ndarray] = None,
+                 seed: Optional[int] = None,
+                 processes: bool = True,
+                 mutation_rate: float = MUTATION_RATE):
+        if topology not in ISLAND_TOPOLOGIES:
+            raise ValueError(f"Topologia desconhecida: {topology}")
+
+        self.context = context
+        self.interval = max(1, interval)
+        self.migrants = max(1, migrants)
+        self.topology = topology
+        self.configs = island_configs(ga_config, max(1, islands))
+        self.generation = 0
+        self.best_tour = None
+        self.best_fitness = float('inf')
+
+        self.rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+        seeds = self.rng.integers(2**63, size=len(self.configs))
+        seeding = SEEDING_PERCENT if seeding is None else seeding
+
+        self._islands = []
+        self._connections = []
+        self._processes = []
+        self._shared = None
+
+        if processes and len(self.configs) > 1:
+            self._shared = SharedArrays({name: getattr(context, name) for name in SHARED_CONTEXT_ARRAYS})
+            mp_context = mp.get_context()
+            for config, island_seed in zip(self.configs, seeds):
+                parent_conn, child_conn = mp_context.Pipe()
+                process = mp_context.Process(
+                    target=_island_worker,
+                    args=(child_conn, self._shared.spec(), context.vehicles,
+                          context.priority_weight, context.distance_weight,
+                          config, population_size, seeding, city_latlng,
+                          int(island_seed), mutation_rate),
+                    daemon=True
+                )
+                process.start()
+                child_conn.close()
+                self._connections.append(parent_conn)
+                self._processes.append(process)
+            results = [conn.recv() for conn in self._connections]
+        else:
+            for config, island_seed in zip(self.configs, seeds):
+                self._islands.append(
+                    Island(context, config, population_size, seeding, city_latlng, int(island_seed),
+                           mutation_rate)
+                )
+            results = [island.snapshot() for island in self._islands]
+
+        self._collect(results)
+
+    def _collect(self, results):
+        # Emigrantes: os `migrants` melhores de cada ilha
+        self._emigrants = [(tours[:self.migrants], fitness[:self.migrants]) for tours, fitness in results]
+        for tours, fitness in results:
+            if fitness[0] < self.best_fitness:
+                self.best_fitness = float(fitness[0])
+                self.best_tour = tours[0].copy()
+
+        self.population, self.fitness = sort_population(
+            np.vstack([tours for tours, _ in results]),
+            np.concatenate([fitness for _, fitness in results])
+        )
+
+    def step(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Migração (dos melhores da rodada anterior) + `interval` gerações em
+        cada ilha. Retorna a população agregada de todas as ilhas, ordenada.
+        """
+        targets = migration_targets(len(self.configs), self.topology, self.rng)
+        incoming = [(None, None)] * len(self.configs)
+        if len(self.configs) > 1:
+            for source, target in enumerate(targets):
+                incoming[target] = self._emigrants[source]
+
+        if self._connections:
+            for conn, (tours, fitness) in zip(self._connections, incoming):
+                conn.send((tours, fitness, self.interval))
+            results = [conn.recv() for conn in self._connections]
+        else:
+            results = []
+            for island, (tours, fitness) in zip(self._islands, incoming):
+                if tours is not None:
+                    island.receive(tours, fitness)
+                island.evolve(self.interval)
+                results.append(island.snapshot())
+
+        self.generation += self.interval
+        self._collect(results)
+        return self.population, self.fitness
+
+    def close(self):
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._processes = []
+
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
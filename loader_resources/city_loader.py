@@ -52,4 +52,29 @@ def load_city_coordinates_from_csv(
                 lng = float(row["lng"])
                 coords[original_name] = (lat, lng)
 
-    return coords
\ No newline at end of file
+    return coords
+
+
+def build_distance_matrix(
+    city_names: List[str],
+    distance_lookup: Dict[Tuple[str, str], float]
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Converte o dicionário de distâncias em uma matriz densa (float64, C-contígua).
+    Retorna (matriz, cidade -> índice), com o índice seguindo a ordem de city_names.
+    Pares ausentes usam a direção inversa e, na falta dela, 0.0.
+    """
+    city_index = {city: i for i, city in enumerate(city_names)}
+    size = len(city_names)
+    matrix = np.zeros((size, size), dtype=np.float64)
+
+    for i, city1 in enumerate(city_names):
+        for j, city2 in enumerate(city_names):
+            if i == j:
+                continue
+            distance = distance_lookup.get((city1, city2))
+            if distance is None:
+                distance = distance_lookup.get((city2, city1), 0.0)
+            matrix[i, j] = distance
+
+    return np.ascontiguousarray(matrix), city_index
@@ -1,29 +1,36 @@
 # data_loader.py
 
-import pygame
+import numpy as np
 from collections import defaultdict
 from typing import Dict, List, Tuple
 
-from loader_resources.delivery_loader import load_deliveries
+from loader_resources.delivery_loader import load_deliveries, build_city_aggregates
 from loader_resources.vehicle_loader import load_vehicles
-from loader_resources.city_loader import load_distances_from_tsv, load_city_coordinates_from_csv
-from sp_map import (
-    build_sp_map_surface, 
-    project_latlng, 
+from loader_resources.city_loader import (
+    load_distances_from_tsv,
+    load_city_coordinates_from_csv,
+    build_distance_matrix
+)
+from loader_resources.geo_projection import (
+    MapRect,
+    project_latlng,
     SP_BOUNDS,
     calculate_geojson_distances
 )
 from config import MAP_WIDTH, HEIGHT, INFO_WIDTH
+from genetic_algorithm import PRIORITY_WEIGHTS
 
 
 def load_all_data(deliveries_path: str = "data_files/deliveries.csv",
                   distances_path: str = "data_files/cidades_sp.tsv",
                   vehicles_path: str = "data_files/veiculos.csv",
                   coordinates_path: str = "data_files/worldcities.csv",
-                  geojson_path: str = "data_files/geojs-35-mun.json"):
+                  geojson_path: str = "data_files/geojs-35-mun.json",
+                  build_map: bool = True):
     """
     Carrega todos os dados necessários para o TSP.
     Retorna um dicionário com todos os dados carregados.
+    build_map=False pula a geração do mapa (execução sem interface).
     """
     
     print("\n🔄 Carregando dados...")
@@ -36,6 +43,8 @@ def load_all_data(deliveries_path: str = "data_files/deliveries.csv",
     cities = sorted(deliveries_by_city.keys())
     print(f"✅ {len(cities)} cidades para entregas: {cities}")
 
+    city_aggregates = build_city_aggregates(cities, deliveries_by_city, PRIORITY_WEIGHTS)
+
     try:
         _, distance_lookup = load_distances_from_tsv(distances_path)
         
@@ -70,6 +79,9 @@ def load_all_data(deliveries_path: str = "data_files/deliveries.csv",
                 else:
                     distance_lookup[(city1, city2)] = abs(i - j) * 50 + 30
 
+    distance_matrix, city_index = build_distance_matrix(cities, distance_lookup)
+    print(f"✅ Matriz de distâncias {distance_matrix.shape[0]}x{distance_matrix.shape[1]} montada")
+
     vehicles = load_vehicles(vehicles_path)
     print(f"✅ {len(vehicles)} veículos carregados")
 
@@ -108,7 +120,7 @@ def load_all_data(deliveries_path: str = "data_files/deliveries.csv",
 
     print("\n🗺️ Posicionando cidades no mapa...")
 
-    map_rect = pygame.Rect(INFO_WIDTH, 0, MAP_WIDTH, HEIGHT)
+    map_rect = MapRect(INFO_WIDTH, 0, MAP_WIDTH, HEIGHT)
 
     city_to_coord = {}
     for city, (lat, lng) in city_latlng.items():
@@ -117,23 +129,36 @@ def load_all_data(deliveries_path: str = "data_files/deliveries.csv",
         print(f"  ✓ {city}: ({lat:.2f}, {lng:.2f}) → ({x}, {y})")
 
     coords = [city_to_coord[c] for c in cities]
+    city_latlng_array = np.array([city_latlng[c] for c in cities], dtype=np.float64)
     coord_to_city = {coord: city for city, coord in city_to_coord.items()}
 
     print(f"\n✅ {len(coords)} coordenadas mapeadas usando project_latlng()")
 
-    print("\n🗺️ Gerando mapa de São Paulo...")
-    map_surface = build_sp_map_surface(
-        size=(MAP_WIDTH, HEIGHT),
-        geojson_path=geojson_path
-    )
+    map_surface = None
+    if build_map:
+        # Só a interface precisa de pygame
+        from sp_map import build_sp_map_surface
+
+        print("\n🗺️ Gerando mapa de São Paulo...")
+        map_surface = build_sp_map_surface(
+            size=(MAP_WIDTH, HEIGHT),
+            geojson_path=geojson_path
+        )
 
     return {
         'deliveries': deliveries,
         'deliveries_by_city': deliveries_by_city,
         'cities': cities,
         'distance_lookup': distance_lookup,
+        'distance_matrix': distance_matrix,
+        'city_index': city_index,
+        'city_weights': city_aggregates['weight'],
+        'city_delivery_counts': city_aggregates['delivery_count'],
+        'city_priority_weights': city_aggregates['priority_weight'],
+        'city_min_priority': city_aggregates['min_priority'],
         'vehicles': vehicles,
         'city_latlng': city_latlng,
+        'city_latlng_array': city_latlng_array,
         'city_to_coord': city_to_coord,
         'coords': coords,
         'coord_to_city': coord_to_city,
@@ -1,5 +1,7 @@
 import csv
+import numpy as np
 from collections import defaultdict
+from typing import Dict, List
 
 class Delivery:
     def __init__(
@@ -40,3 +42,31 @@ def load_deliveries(path: str):
             )
 
     return deliveries
+
+
+def build_city_aggregates(cities: List[str],
+                          deliveries_by_city: Dict[str, List[Delivery]],
+                          priority_weights: Dict[int, float]) -> Dict[str, np.ndarray]:
+    """
+    Pré-calcula, por índice de cidade, os totais usados na função fitness.
+    """
+    weights = np.zeros(len(cities), dtype=np.float64)
+    counts = np.zeros(len(cities), dtype=np.int64)
+    summed_priority_weights = np.zeros(len(cities), dtype=np.float64)
+    min_priorities = np.full(len(cities), 2, dtype=np.int64)
+
+    for i, city in enumerate(cities):
+        deliveries = deliveries_by_city.get(city, [])
+        for d in deliveries:
+            weights[i] += d.total_weight
+            summed_priority_weights[i] += priority_weights.get(d.priority, 50)
+        counts[i] = len(deliveries)
+        if deliveries:
+            min_priorities[i] = min(d.priority for d in deliveries)
+
+    return {
+        'weight': weights,
+        'delivery_count': counts,
+        'priority_weight': summed_priority_weights,
+        'min_priority': min_priorities
+    }
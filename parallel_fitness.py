@@ -0,0 +1,325 @@
+# parallel_fitness.py
+"""
+Avaliação de fitness em paralelo (multiprocessing).
+
+A matriz de distâncias e os agregados por cidade são copiados uma única vez
+para multiprocessing.shared_memory; os workers apenas se conectam aos blocos
+e nunca recebem esses arrays por pickle. Cada chamada envia só as linhas da
+população (índices de cidades) de cada fatia.
+
+Com workers <= 1, ou lotes pequenos demais para compensar o IPC, a avaliação
+é feita no próprio processo (fallback serial). No TSP o limiar é o trabalho
+por fatia (linhas x cidades, PARALLEL_MIN_TSP_CELLS): avaliar uma linha custa
+tanto quanto enviá-la ao worker, então só populações enormes usam o pool.
+No VRP só as rotas sujas vão aos workers, e só quando somam paradas
+suficientes por fatia (PARALLEL_MIN_VRP_STOPS).
+"""
+import os
+import itertools
+import multiprocessing as mp
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from genetic_algorithm import FitnessContext, calculate_population_fitness
+from config import FITNESS_WORKERS, PARALLEL_MIN_TSP_CELLS, PARALLEL_MIN_VRP_STOPS
+
+
+# Arrays do FitnessContext colocados em memória compartilhada
+SHARED_CONTEXT_ARRAYS = (
+    "distance_matrix",
+    "city_weights",
+    "city_priority_weights",
+    "city_min_priority"
+)
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    Número efetivo de processos: 0/None usa todos os núcleos.
+    """
+    if workers is None:
+        workers = FITNESS_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def _shard_bounds(rows: int, workers: int, min_chunk: int) -> List[range]:
+    """
+    Divide `rows` em fatias contíguas, no máximo uma por worker e nenhuma
+    menor que min_chunk. Uma única fatia significa avaliação serial.
+    """
+    shards = max(1, min(workers, rows // max(1, min_chunk)))
+    edges = np.linspace(0, rows, shards + 1).astype(int)
+    return [range(edges[k], edges[k + 1]) for k in range(shards)]
+
+
+# =========================
+# MEMÓRIA COMPARTILHADA
+# =========================
+
+class SharedArrays:
+    """
+    Dono dos blocos de shared_memory de um conjunto de arrays.
+    spec() descreve os blocos para os workers se conectarem.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks = {}
+        self._spec = {}
+
+        for name, array in arrays.items():
+            if array is None:
+                continue
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            view[...] = array
+            self._blocks[name] = block
+            self._spec[name] = (block.name, array.shape, array.dtype.str)
+
+    def spec(self) -> Dict:
+        return dict(self._spec)
+
+    def close(self):
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+        self._spec.clear()
+
+
+def attach_arrays(spec: Dict):
+    """
+    Conecta-se aos blocos descritos por SharedArrays.spec().
+    Retorna (arrays, blocos); os blocos devem ser mantidos vivos enquanto
+    os arrays forem usados.
+    """
+    arrays, blocks = {}, []
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        blocks.append(block)
+    return arrays, blocks
+
+
+# =========================
+# WORKERS
+# =========================
+
+# Estado de cada processo worker (preenchido pelo initializer do pool)
+_worker_context = None
+_worker_blocks = []
+_worker_vrp = None
+
+
+def _init_tsp_worker(spec, vehicles, priority_weight, distance_weight):
+    global _worker_context, _worker_blocks
+    arrays, _worker_blocks = attach_arrays(spec)
+    _worker_context = FitnessContext(
+        vehicles=vehicles,
+        priority_weight=priority_weight,
+        distance_weight=distance_weight,
+        **{name: arrays.get(name) for name in SHARED_CONTEXT_ARRAYS}
+    )
+
+
+def _evaluate_tsp_shard(pop_matrix: np.ndarray) -> np.ndarray:
+    return calculate_population_fitness(pop_matrix, _worker_context)
+
+
+def _init_vrp_worker(coord_to_city, deliveries_by_city, distance_lookup,
+                     distance_matrix, city_index):
+    global _worker_vrp
+    _worker_vrp = (coord_to_city, deliveries_by_city, distance_lookup,
+                   distance_matrix, city_index)
+
+
+def _evaluate_route_shard(routes):
+    """Estatísticas de rotas (veículo, coordenadas, depósito) recalculadas no worker."""
+    from vrp_solver import VRPRoute
+
+    stats = []
+    for vehicle, route, depot_coord in routes:
+        solved = VRPRoute(vehicle, route, depot_coord)
+        solved.calculate_stats(*_worker_vrp)
+        stats.append(solved.stats())
+    return stats
+
+
+def evaluate_vrp_solution(solution, coord_to_city, deliveries_by_city, distance_lookup,
+                          all_cities, options, generation, max_generations,
+                          distance_matrix=None, city_index=None):
+    """
+    Recalcula as estatísticas das rotas sujas e o fitness de uma solução VRP.
+    Com distance_matrix e city_index as distâncias das rotas vêm da matriz.
+    """
+    from vrp_solver import calculate_vrp_fitness
+
+    for route in solution:
+        route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup,
+                              distance_matrix, city_index)
+
+    return calculate_vrp_fitness(
+        solution, coord_to_city, deliveries_by_city,
+        distance_lookup, all_cities, options, generation, max_generations
+    )
+
+
+class _PoolEvaluator(ABC):
+    """
+    Base: pool criado sob demanda na primeira avaliação paralela.
+    """
+
+    def __init__(self, workers: Optional[int], min_chunk: Optional[int]):
+        self.workers = resolve_workers(workers)
+        self.min_chunk = min_chunk
+        self._pool = None
+
+    @abstractmethod
+    def _initializer(self):
+        """(função initializer, argumentos) dos workers do pool."""
+
+    def _get_pool(self):
+        if self._pool is None:
+            initializer, initargs = self._initializer()
+            self._pool = mp.get_context().Pool(self.workers, initializer, initargs)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =========================
+# TSP
+# =========================
+
+class ParallelEvaluator(_PoolEvaluator):
+    """
+    Avaliador de populações TSP (matriz P x n) compatível com
+    calculate_population_fitness: evaluator(pop_matrix, context).
+    Sem min_chunk, a menor fatia é min_cells / n linhas.
+    """
+
+    def __init__(self, context: FitnessContext,
+                 workers: Optional[int] = None,
+                 min_chunk: Optional[int] = None,
+                 min_cells: int = PARALLEL_MIN_TSP_CELLS):
+        super().__init__(workers, min_chunk)
+        self.context = context
+        self.min_cells = min_cells
+        self._shared = None
+
+    def shards(self, rows: int, cities: int = 1) -> List[range]:
+        if self.workers <= 1:
+            return [range(rows)]
+        min_chunk = self.min_chunk
+        if min_chunk is None:
+            min_chunk = -(-self.min_cells // max(1, cities))
+        return _shard_bounds(rows, self.workers, min_chunk)
+
+    def _initializer(self):
+        if self._shared is None:
+            self._shared = SharedArrays(
+                {name: getattr(self.context, name) for name in SHARED_CONTEXT_ARRAYS}
+            )
+        return _init_tsp_worker, (
+            self._shared.spec(),
+            self.context.vehicles,
+            self.context.priority_weight,
+            self.context.distance_weight
+        )
+
+    def __call__(self, pop_matrix: np.ndarray, context: Optional[FitnessContext] = None) -> np.ndarray:
+        context = context or self.context
+        shards = self.shards(*np.shape(pop_matrix))
+
+        # O pool só conhece o contexto compartilhado
+        if len(shards) <= 1 or context is not self.context:
+            return calculate_population_fitness(pop_matrix, context)
+
+        pieces = self._get_pool().map(
+            _evaluate_tsp_shard,
+            [pop_matrix[shard.start:shard.stop] for shard in shards]
+        )
+        return np.concatenate(pieces)
+
+    def close(self):
+        super().close()
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+
+# =========================
+# VRP
+# =========================
+
+class ParallelVRPEvaluator(_PoolEvaluator):
+    """
+    Avaliador da população VRP (listas de VRPRoute).
+    Os dicionários de consulta (e a matriz de distâncias, se houver) são
+    enviados uma vez por worker (initializer); cada geração envia só as rotas
+    sujas e recebe as estatísticas delas. O fitness é calculado no processo
+    principal, com todas as rotas já limpas.
+    Sem min_chunk, a menor fatia é min_stops paradas de rotas sujas.
+    """
+
+    def __init__(self, coord_to_city, deliveries_by_city, distance_lookup,
+                 all_cities, options,
+                 workers: Optional[int] = None,
+                 min_chunk: Optional[int] = None,
+                 distance_matrix: Optional[np.ndarray] = None,
+                 city_index: Optional[Dict[str, int]] = None,
+                 min_stops: int = PARALLEL_MIN_VRP_STOPS):
+        super().__init__(workers, min_chunk)
+        self.min_stops = min_stops
+        self._lookup = (coord_to_city, deliveries_by_city, distance_lookup)
+        self._scoring = (all_cities, options)
+        self._distances = (distance_matrix, city_index)
+
+    def shards(self, rows: int, stops: int = 0) -> List[range]:
+        if self.workers <= 1:
+            return [range(rows)]
+        min_chunk = self.min_chunk
+        if min_chunk is None:
+            min_chunk = -(-self.min_stops * rows // max(1, stops))
+        return _shard_bounds(rows, self.workers, min_chunk)
+
+    def _initializer(self):
+        return _init_vrp_worker, self._lookup + self._distances
+
+    def evaluate(self, population, generation: int, max_generations: int) -> List[float]:
+        """
+        Fitness de cada solução; as estatísticas das rotas são atualizadas
+        no lugar, como no cálculo serial.
+        """
+        dirty = [route for solution in population for route in solution if route.is_dirty]
+        shards = self.shards(len(dirty), sum(len(route.route) for route in dirty))
+
+        if len(shards) > 1:
+            results = self._get_pool().map(
+                _evaluate_route_shard,
+                [[(route.vehicle, list(route.route), route.depot_coord) for route in dirty[shard.start:shard.stop]]
+                 for shard in shards]
+            )
+            for route, stats in zip(dirty, itertools.chain.from_iterable(results)):
+                route.apply_stats(stats)
+
+        return [
+            evaluate_vrp_solution(solution, *self._lookup, *self._scoring, generation, max_generations,
+                                  *self._distances)
+            for solution in population
+        ]
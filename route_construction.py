@@ -0,0 +1,333 @@
+# route_construction.py
+"""
+Heurísticas construtivas para a população inicial do VRP.
+
+Cada construtor devolve uma solução completa (lista de VRPRoute) que respeita
+max_weight e max_distance dos veículos sempre que a frota permite, para que o
+AG comece de pontos viáveis em vez de partições aleatórias.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from loader_resources.city_loader import build_distance_matrix
+
+
+# Folga numérica nas comparações com max_weight / max_distance
+LIMIT_TOLERANCE = 1e-9
+
+
+@dataclass
+class RoutingData:
+    """
+    Matriz de distâncias e pesos das cidades (índices 0..n-1 em `coords`)
+    e distâncias de ida/volta ao depósito, no formato de calculate_route_distance.
+    """
+    coords: List[Tuple]
+    distance_matrix: np.ndarray
+    depot_out: np.ndarray        # depósito -> cidade
+    depot_back: np.ndarray       # cidade -> depósito
+    city_weights: np.ndarray
+    vehicles: List
+    depot_coord: Tuple
+    symmetric: bool = field(init=False)
+    limits: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.symmetric = bool(
+            np.allclose(self.distance_matrix, self.distance_matrix.T)
+            and np.allclose(self.depot_out, self.depot_back)
+        )
+        # Colunas: max_weight, max_distance (limites distintos da frota)
+        self.limits = np.unique(
+            np.array([[v.max_weight, v.max_distance] for v in self.vehicles], dtype=np.float64),
+            axis=0
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.coords)
+
+    def fits(self, weight: float, distance: float) -> bool:
+        """True se algum veículo da frota comporta a rota."""
+        return bool(np.any(
+            (self.limits[:, 0] + LIMIT_TOLERANCE >= weight)
+            & (self.limits[:, 1] + LIMIT_TOLERANCE >= distance)
+        ))
+
+    def route_distance(self, route: List[int]) -> float:
+        """Distância de depósito -> route -> depósito."""
+        if not route:
+            return 0.0
+        inner = self.distance_matrix[route[:-1], route[1:]].sum()
+        return float(self.depot_out[route[0]] + inner + self.depot_back[route[-1]])
+
+
+def build_routing_data(cities_coords, coord_to_city, deliveries_by_city,
+                       distance_lookup, vehicles, depot_coord) -> RoutingData:
+    """Monta RoutingData a partir dos mesmos argumentos de solve_vrp."""
+    names = [coord_to_city[coord] for coord in cities_coords]
+    names.append(coord_to_city[depot_coord])
+    matrix, _ = build_distance_matrix(names, distance_lookup)
+
+    size = len(cities_coords)
+    weights = np.array([
+        sum(d.total_weight for d in deliveries_by_city.get(name, []))
+        for name in names[:size]
+    ], dtype=np.float64)
+
+    return RoutingData(
+        coords=list(cities_coords),
+        distance_matrix=np.ascontiguousarray(matrix[:size, :size]),
+        depot_out=matrix[size, :size].copy(),
+        depot_back=matrix[:size, size].copy(),
+        city_weights=weights,
+        vehicles=list(vehicles),
+        depot_coord=depot_coord
+    )
+
+
+# =========================
+# ATRIBUIÇÃO DE VEÍCULOS
+# =========================
+
+def assign_vehicles(routes: List[List[int]], data: RoutingData):
+    """
+    Rotas de índices -> lista de VRPRoute. As rotas mais pesadas escolhem
+    primeiro o veículo disponível mais barato que as comporta; sem nenhum,
+    usam o de maior capacidade. Rotas que sobram além da frota são anexadas
+    à rota mais leve (a solução fica inviável e o AG corrige).
+    """
+    from vrp_solver import VRPRoute
+
+    available = list(data.vehicles)
+    planned = []
+    for route in sorted(routes, key=lambda r: -data.city_weights[r].sum()):
+        weight = float(data.city_weights[route].sum())
+        distance = data.route_distance(route)
+
+        if not available:
+            lightest = min(planned, key=lambda p: data.city_weights[p[1]].sum())
+            lightest[1].extend(route)
+            continue
+
+        fitting = [
+            v for v in available
+            if v.max_weight + LIMIT_TOLERANCE >= weight
+            and v.max_distance + LIMIT_TOLERANCE >= distance
+        ]
+        if fitting:
+            vehicle = min(fitting, key=lambda v: (v.cost_per_km, v.max_weight))
+        else:
+            vehicle = max(available, key=lambda v: v.max_weight)
+        available.remove(vehicle)
+        planned.append((vehicle, list(route)))
+
+    return [
+        VRPRoute(vehicle, [data.coords[c] for c in route], data.depot_coord)
+        for vehicle, route in planned
+    ]
+
+
+# =========================
+# CLARKE-WRIGHT (SAVINGS)
+# =========================
+
+def savings_routes(data: RoutingData, noise: float = 0.0,
+                   rng: Optional[np.random.Generator] = None) -> List[List[int]]:
+    """
+    Algoritmo de economias (Clarke-Wright, versão paralela). Parte de uma rota
+    depósito -> i -> depósito por cidade e une, em ordem decrescente de
+    s(i, j) = volta(i) + ida(j) - d(i, j), rotas em que i é a última cidade
+    de uma e j a primeira da outra, desde que algum veículo comporte o peso
+    e a distância resultantes. Com distâncias simétricas as rotas podem ser
+    invertidas para unir extremidades.
+
+    noise > 0 multiplica cada economia por um fator em [1 - noise, 1 + noise];
+    empates são desfeitos aleatoriamente, então cada chamada gera uma semente
+    diferente.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    size = data.size
+    matrix = data.distance_matrix
+    if data.symmetric:
+        first, second = np.triu_indices(size, k=1)
+    else:
+        first, second = np.nonzero(~np.eye(size, dtype=bool))
+    savings = data.depot_back[first] + data.depot_out[second] - matrix[first, second]
+    if noise > 0:
+        savings = savings * (1.0 + noise * rng.uniform(-1.0, 1.0, savings.size))
+
+    # Só economias positivas; desempate aleatório
+    positive = savings > 0
+    first, second, savings = first[positive], second[positive], savings[positive]
+    order = np.lexsort((rng.random(savings.size), -savings))
+
+    routes = {c: [c] for c in range(size)}
+    route_of = list(range(size))
+    weight = {c: float(data.city_weights[c]) for c in range(size)}
+    distance = {c: float(data.depot_out[c] + data.depot_back[c]) for c in range(size)}
+
+    for i, j in zip(first[order].tolist(), second[order].tolist()):
+        a, b = route_of[i], route_of[j]
+        if a == b:
+            continue
+        route_a, route_b = routes[a], routes[b]
+
+        if route_a[-1] == i and route_b[0] == j:
+            merged = route_a + route_b
+        elif not data.symmetric:
+            continue
+        elif route_a[0] == i and route_b[-1] == j:
+            merged = route_b + route_a
+        elif route_a[-1] == i and route_b[-1] == j:
+            merged = route_a + route_b[::-1]
+        elif route_a[0] == i and route_b[0] == j:
+            merged = route_a[::-1] + route_b
+        else:
+            continue
+
+        merged_weight = weight[a] + weight[b]
+        # Distância exata: a economia perturbada só decide a ordem
+        merged_distance = distance[a] + distance[b] - (
+            data.depot_back[i] + data.depot_out[j] - matrix[i, j]
+        )
+        if not data.fits(merged_weight, merged_distance):
+            continue
+
+        routes[a] = merged
+        weight[a] = merged_weight
+        distance[a] = merged_distance
+        for c in route_b:
+            route_of[c] = a
+        del routes[b], weight[b], distance[b]
+
+    return list(routes.values())
+
+
+def build_savings_solution(data: RoutingData, noise: float = 0.0,
+                           rng: Optional[np.random.Generator] = None):
+    """Solução completa (lista de VRPRoute) pelo algoritmo de economias."""
+    return assign_vehicles(savings_routes(data, noise, rng), data)
+
+
+# =========================
+# VARREDURA POLAR (SWEEP)
+# =========================
+
+def polar_angles(points, origin, geographic: bool = True) -> np.ndarray:
+    """
+    Ângulo (rad, em [0, 2π)) de cada ponto em torno de origin. Com
+    geographic=True os pontos são (lat, lng) e a longitude é escalada por
+    cos(lat) da origem (projeção equirretangular); senão são coordenadas de
+    tela (y cresce para baixo).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if geographic:
+        dx = (points[:, 1] - origin[1]) * np.cos(np.radians(origin[0]))
+        dy = points[:, 0] - origin[0]
+    else:
+        dx = points[:, 0] - origin[0]
+        dy = origin[1] - points[:, 1]
+    return np.mod(np.arctan2(dy, dx), 2 * np.pi)
+
+
+def sweep_routes(data: RoutingData, angles: np.ndarray, start_angle: float = 0.0,
+                 clockwise: bool = False) -> List[List[int]]:
+    """
+    Varredura polar: ordena as cidades pelo ângulo a partir de start_angle
+    (O(n log n)) e as percorre enchendo uma rota por vez. Cada rota é cortada
+    pelo veículo que deve usá-la: o livre mais barato (custo/km, depois
+    capacidade) que atende sozinho a primeira cidade, a mesma preferência de
+    assign_vehicles. A rota é fechada quando a próxima cidade estouraria o
+    peso ou a distância (com a volta ao depósito) desse veículo. A ordem
+    angular de cada rota só é melhorada localmente (_two_opt_route), então o
+    ângulo inicial e o sentido continuam definindo a semente.
+    """
+    offset = np.mod(angles - start_angle, 2 * np.pi)
+    if clockwise:
+        offset = np.mod(-offset, 2 * np.pi)
+    order = np.argsort(offset, kind="stable").tolist()
+
+    available = list(data.vehicles)
+    largest = max(available, key=lambda v: (v.max_weight, v.max_distance))
+
+    def route_vehicle(c):
+        # Frota esgotada: segue no maior veículo (assign_vehicles junta as sobras)
+        if not available:
+            return largest
+        fitting = [
+            v for v in available
+            if v.max_weight + LIMIT_TOLERANCE >= data.city_weights[c]
+            and v.max_distance + LIMIT_TOLERANCE >= data.depot_out[c] + data.depot_back[c]
+        ]
+        if fitting:
+            vehicle = min(fitting, key=lambda v: (v.cost_per_km, v.max_weight))
+        else:
+            vehicle = max(available, key=lambda v: (v.max_weight, v.max_distance))
+        available.remove(vehicle)
+        return vehicle
+
+    routes = []
+    route, weight, path, vehicle = [], 0.0, 0.0, None
+    for c in order:
+        if route:
+            next_path = path + data.distance_matrix[route[-1], c]
+            next_weight = weight + data.city_weights[c]
+            fits = (
+                next_weight <= vehicle.max_weight + LIMIT_TOLERANCE
+                and next_path + data.depot_back[c] <= vehicle.max_distance + LIMIT_TOLERANCE
+            )
+            if fits:
+                route.append(c)
+                weight, path = next_weight, next_path
+                continue
+            routes.append(route)
+        vehicle = route_vehicle(c)
+        route, weight, path = [c], data.city_weights[c], data.depot_out[c]
+
+    if route:
+        routes.append(route)
+    return [_two_opt_route(route, data) for route in routes]
+
+
+def _two_opt_route(route: List[int], data: RoutingData) -> List[int]:
+    """
+    2-opt de primeira melhoria na rota (depósito nas pontas) partindo da
+    ordem dada: desfaz cruzamentos da ordem angular sem reordená-la do zero.
+    Só com distâncias simétricas; nunca aumenta a distância. O(k²) por passada.
+    """
+    if len(route) < 3 or not data.symmetric:
+        return route
+
+    # Índice 0 é o depósito; 1..k são as cidades da rota
+    size = len(route) + 1
+    local = np.zeros((size, size))
+    local[1:, 1:] = data.distance_matrix[np.ix_(route, route)]
+    local[0, 1:] = data.depot_out[route]
+    local[1:, 0] = data.depot_back[route]
+    dist = local.tolist()
+
+    path = list(range(size)) + [0]
+    improved = True
+    while improved:
+        improved = False
+        for i in range(size - 1):
+            a, b = path[i], path[i + 1]
+            for j in range(i + 2, size):
+                c, e = path[j], path[j + 1]
+                if dist[a][c] + dist[b][e] < dist[a][b] + dist[c][e] - LIMIT_TOLERANCE:
+                    path[i + 1:j + 1] = path[i + 1:j + 1][::-1]
+                    b = path[i + 1]
+                    improved = True
+
+    return [route[k - 1] for k in path[1:-1]]
+
+
+def build_sweep_solution(data: RoutingData, angles: np.ndarray, start_angle: float = 0.0,
+                         clockwise: bool = False):
+    """Solução completa (lista de VRPRoute) pela varredura polar."""
+    return assign_vehicles(sweep_routes(data, angles, start_angle, clockwise), data)
@@ -1,6 +1,9 @@
 # route_helpers.py
 
 from typing import List, Tuple, Dict, Optional
+
+import numpy as np
+
 from config import RED, ORANGE, GREEN
 
 
@@ -40,13 +43,21 @@ def calculate_route_weight(route: List[Tuple[int, int]],
 
 def calculate_route_distance(route: List[Tuple[int, int]],
                              coord_to_city: Dict[Tuple[int, int], str],
-                             distance_lookup: Dict[Tuple[str, str], float]) -> float:
+                             distance_lookup: Dict[Tuple[str, str], float],
+                             distance_matrix: Optional[np.ndarray] = None,
+                             city_index: Optional[Dict[str, int]] = None) -> float:
     """
     Calcula a distância total de uma rota em km.
+    Com distance_matrix e city_index (de load_all_data) usa acesso por índice
+    em vez de consultar o dicionário par a par.
     """
     if len(route) < 2:
         return 0.0
     
+    if distance_matrix is not None and city_index is not None:
+        idx = np.array([city_index[coord_to_city[coord]] for coord in route], dtype=np.intp)
+        return float(distance_matrix[idx, np.roll(idx, -1)].sum())
+    
     dist = 0.0
     for i in range(len(route)):
         city1 = coord_to_city[route[i]]
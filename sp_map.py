@@ -1,17 +1,14 @@
 # sp_map.py
 
 import json
-import math
 import pygame
 from typing import Dict, List, Tuple
 
-
-SP_BOUNDS: Dict[str, float] = {
-    "min_lat": -25.35,
-    "max_lat": -19.75,
-    "min_lng": -53.10,
-    "max_lng": -44.00
-}
+from loader_resources.geo_projection import (
+    SP_BOUNDS,
+    calculate_geojson_distances,
+    project_latlng
+)
 
 
 def load_geojson(path: str) -> dict:
@@ -19,53 +16,6 @@ def load_geojson(path: str) -> dict:
         return json.load(f)
 
 
-def calculate_geojson_distances(geojson_path: str, city_list: List[str]) -> Dict[Tuple[str, str], float]:
-    """
-    Calcula distâncias entre cidades usando centroides do GeoJSON.
-    Retorna dicionário de distâncias: {(cidade1, cidade2): distancia_km}
-    """
-    print("📊 Calculando distâncias do GeoJSON...")
-    try:
-        with open(geojson_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        city_coords = {}
-        for feature in data['features']:
-            city_name = feature['properties'].get('name', '')
-            for target_city in city_list:
-                if (target_city.lower() in city_name.lower() or 
-                    city_name.lower() in target_city.lower()):
-                    geometry = feature['geometry']
-                    if geometry['type'] == 'Polygon':
-                        coords = geometry['coordinates'][0]
-                        lons = [c[0] for c in coords]
-                        lats = [c[1] for c in coords]
-                        center_lon = sum(lons) / len(lons)
-                        center_lat = sum(lats) / len(lats)
-                        city_coords[target_city] = (center_lat, center_lon)
-                        break
-        
-        new_distances = {}
-        for city1 in city_list:
-            for city2 in city_list:
-                if city1 == city2:
-                    new_distances[(city1, city2)] = 0.0
-                    new_distances[(city2, city1)] = 0.0
-                elif city1 in city_coords and city2 in city_coords:
-                    lat1, lon1 = city_coords[city1]
-                    lat2, lon2 = city_coords[city2]
-                    dist = math.sqrt((lat2 - lat1)**2 + (lon2 - lon1)**2) * 111.0
-                    new_distances[(city1, city2)] = dist
-                    new_distances[(city2, city1)] = dist
-        
-        print(f"✅ {len(new_distances)//2} distâncias calculadas do GeoJSON")
-        return new_distances
-        
-    except Exception as e:
-        print(f"✗ Erro ao calcular distâncias do GeoJSON: {e}")
-        return {}
-
-
 def load_city_positions_from_geojson(geojson_path: str, target_cities: List[str]) -> Tuple[Dict, Dict]:
     """
     Carrega posições das cidades a partir do GeoJSON.
@@ -141,34 +91,6 @@ def load_city_positions_from_geojson(geojson_path: str, target_cities: List[str]
         return {}, None
 
 
-def project_latlng(lat: float,
-                   lng: float,
-                   map_rect: pygame.Rect,
-                   bounds: Dict[str, float],
-                   padding_ratio: float = 0.06) -> Tuple[int, int]:
-    """
-    Converte lat/lng reais para coordenadas de tela,
-    mantendo proporção e margem interna.
-    """
-    pad_x = map_rect.width * padding_ratio
-    pad_y = map_rect.height * padding_ratio
-
-    usable_w = map_rect.width - pad_x * 2
-    usable_h = map_rect.height - pad_y * 2
-
-    x_norm = (lng - bounds["min_lng"]) / (
-        bounds["max_lng"] - bounds["min_lng"]
-    )
-    y_norm = (lat - bounds["min_lat"]) / (
-        bounds["max_lat"] - bounds["min_lat"]
-    )
-
-    screen_x = map_rect.left + pad_x + x_norm * usable_w
-    screen_y = map_rect.top + pad_y + (1 - y_norm) * usable_h
-
-    return int(screen_x), int(screen_y)
-
-
 def draw_sp_map(surface: pygame.Surface,
                 geojson: dict,
                 map_rect: pygame.Rect,
@@ -0,0 +1,107 @@
+# termination.py
+"""
+Critérios de parada comuns ao TSP (solve_tsp/run_tsp_mode) e ao VRP (solve_vrp).
+"""
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from config import (
+    TERMINATION_TIME_LIMIT,
+    TERMINATION_MAX_EVALUATIONS,
+    TERMINATION_TARGET_FITNESS,
+    TERMINATION_WINDOW,
+    TERMINATION_MIN_IMPROVEMENT
+)
+
+
+@dataclass
+class TerminationPolicy:
+    """
+    Para quando qualquer critério ativo (não None) for atingido:
+    - time_limit: segundos desde start(); também dispara quando mais uma
+      geração, estimada pela duração da última, passaria do limite
+    - max_generations / max_evaluations
+    - target_fitness: melhor fitness <= alvo
+    - window: melhora relativa do melhor fitness nas últimas `window`
+      gerações menor que min_improvement
+    reason descreve o critério que disparou.
+    """
+    time_limit: Optional[float] = None
+    max_generations: Optional[int] = None
+    max_evaluations: Optional[int] = None
+    target_fitness: Optional[float] = None
+    window: Optional[int] = None
+    min_improvement: float = 1e-3
+    reason: Optional[str] = field(default=None, init=False)
+
+    def __post_init__(self):
+        self._start = None
+        self._last_check = None
+        self._recent = deque(maxlen=(self.window or 0) + 1)
+
+    @classmethod
+    def from_config(cls, **overrides) -> "TerminationPolicy":
+        """Política com os valores TERMINATION_* do config (sobrescrevíveis)."""
+        values = dict(
+            time_limit=TERMINATION_TIME_LIMIT,
+            max_evaluations=TERMINATION_MAX_EVALUATIONS,
+            target_fitness=TERMINATION_TARGET_FITNESS,
+            window=TERMINATION_WINDOW,
+            min_improvement=TERMINATION_MIN_IMPROVEMENT
+        )
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def is_bounded(self) -> bool:
+        """True se algum critério ativo garante que a execução termina."""
+        return any(v is not None for v in (self.time_limit, self.max_generations, self.max_evaluations))
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._last_check = self._start
+        self._recent.clear()
+        self.reason = None
+
+    @property
+    def elapsed(self) -> float:
+        if self._start is None:
+            return 0.0
+        return time.perf_counter() - self._start
+
+    def remaining(self) -> Optional[float]:
+        """Segundos até o limite de tempo (>= 0); None sem time_limit."""
+        if self.time_limit is None:
+            return None
+        return max(0.0, self.time_limit - self.elapsed)
+
+    def should_stop(self, generation: int, evaluations: int, best_fitness: float) -> bool:
+        """
+        Chamada uma vez por geração, depois da avaliação.
+        """
+        if self._start is None:
+            self.start()
+
+        now = time.perf_counter()
+        last_step, self._last_check = now - self._last_check, now
+
+        if self.time_limit is not None and now - self._start + last_step >= self.time_limit:
+            self.reason = f"limite de tempo ({self.time_limit:g}s)"
+        elif self.max_generations is not None and generation >= self.max_generations:
+            self.reason = f"limite de gerações ({self.max_generations})"
+        elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            self.reason = f"limite de avaliações ({self.max_evaluations})"
+        elif self.target_fitness is not None and best_fitness <= self.target_fitness:
+            self.reason = f"fitness alvo atingido ({self.target_fitness:.2f})"
+        elif self.window:
+            self._recent.append(best_fitness)
+            if len(self._recent) == self._recent.maxlen:
+                previous = self._recent[0]
+                improvement = (previous - best_fitness) / max(abs(previous), 1e-12)
+                if improvement < self.min_improvement:
+                    self.reason = (f"melhora < {self.min_improvement:.2%} "
+                                   f"em {self.window} gerações")
+
+        return self.reason is not None
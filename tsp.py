@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import sys
-import itertools
 import pygame
 from pygame.locals import *
 import json
@@ -29,10 +28,12 @@ except ImportError:
 from vrp_menu_gui import show_mode_selection, show_vrp_depot_selection
 from ui_resources.ga_menu_gui import show_ga_menu
 from genetic_algorithm import (
-    generate_random_population,
-    calculate_fitness,
-    sort_population
+    calculate_tour_weight,
+    decode_tour,
+    decode_population
 )
+from tsp_solver import TSPEngine, print_operator_stats
+from termination import TerminationPolicy
 from vrp_solver import solve_vrp
 from vrp_details_renderer import render_vrp_details_panel
 
@@ -57,7 +58,10 @@ def export_solution_to_json(data, solution, mode, depot_city=None, export_path="
         vehicles = data['vehicles']
         
         total_weight = calculate_route_weight(best_route, coord_to_city, deliveries_by_city)
-        total_distance = calculate_route_distance(best_route, coord_to_city, distance_lookup)
+        total_distance = calculate_route_distance(
+            best_route, coord_to_city, distance_lookup,
+            data.get('distance_matrix'), data.get('city_index')
+        )
         vehicle = select_vehicle(total_weight, total_distance, vehicles)
         
         route_details = []
@@ -323,11 +327,12 @@ def run_tsp_mode(data, ga_config):
     coord_to_city = data['coord_to_city']
     map_surface = data['map_surface']
     
-    population = generate_random_population(coords, POPULATION_SIZE)
-    best_history = []
-    distance_history = []
-    best_solution = None
-    best_solution_fitness = float('inf')
+    # O AG roda no motor sem interface; aqui só eventos e renderização
+    engine = TSPEngine(data, ga_config)
+    # Sem critérios configurados, evolui até o usuário sair
+    termination = TerminationPolicy.from_config()
+    termination.start()
+    finished = False
     
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("TSP para Cidades de São Paulo - Algoritmo Genético (Pressione E para Exportar)")
@@ -338,7 +343,6 @@ def run_tsp_mode(data, ga_config):
     show_attempts = DEFAULT_SHOW_ATTEMPTS
     show_coordinates = DEFAULT_SHOW_COORDINATES
     
-    gen = itertools.count(1)
     running = True
     paused = False
     
@@ -360,17 +364,16 @@ def run_tsp_mode(data, ga_config):
                 elif e.key == K_p:
                     paused = not paused
                 elif e.key == K_r:
-                    population = generate_random_population(coords, POPULATION_SIZE)
-                    best_history = []
-                    distance_history = []
-                    best_solution = None
-                    best_solution_fitness = float('inf')
-                    gen = itertools.count(1)
+                    engine.reset()
+                    termination.start()
+                    finished = False
                     print("↻ População reiniciada")
                 elif e.key == K_e:
-                    if best_solution:
+                    if engine.best_solution is not None:
+                        # Refinamento final (2-opt + Or-opt) antes de exportar
+                        best_solution = engine.polish_best()
                         filename = f"tsp_solution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                        export_solution_to_json(data, best_solution, "TSP", export_path=filename)
+                        export_solution_to_json(data, decode_tour(best_solution, coords), "TSP", export_path=filename)
                     else:
                         print("⚠️  Nenhuma solução disponível para exportar")
         
@@ -383,39 +386,30 @@ def run_tsp_mode(data, ga_config):
             clock.tick(5)
             continue
         
-        generation = next(gen)
+        if not finished:
+            engine.step()
+            if termination.should_stop(engine.generation, engine.evaluations, engine.best_fitness):
+                finished = True
+                print(f"🏁 Evolução encerrada na geração {engine.generation}: {termination.reason}")
+        
+        generation = engine.generation
+        population = engine.population
+        fitness = engine.fitness
         
         screen.fill(WHITE)
         pygame.draw.rect(screen, GRAY, (0, 0, INFO_WIDTH, HEIGHT))
         pygame.draw.line(screen, BLACK, (INFO_WIDTH, 0), (INFO_WIDTH, HEIGHT), 2)
         
-        fitness = [
-            calculate_fitness(
-                ind,
-                coord_to_city,
-                deliveries_by_city,
-                vehicles,
-                distance_lookup,
-                priority_weight=PRIORITY_WEIGHT
-            )
-            for ind in population
-        ]
-        
-        population, fitness = sort_population(population, fitness)
-        best = population[0]
         best_fitness = fitness[0]
-        best_history.append(best_fitness)
         
-        total_weight = calculate_route_weight(best, coord_to_city, deliveries_by_city)
-        total_distance_km = calculate_route_distance(best, coord_to_city, distance_lookup)
-        vehicle = select_vehicle(total_weight, total_distance_km, vehicles)
-        distance_history.append(total_distance_km)
+        # Conversão para coordenadas apenas na fronteira de renderização
+        best = decode_tour(population[0], coords)
         
-        if best_fitness < best_solution_fitness:
-            best_solution = best[:]
-            best_solution_fitness = best_fitness
+        total_weight = calculate_tour_weight(population[0], engine.context.city_weights)
+        total_distance_km = engine.distance_history[-1]
+        vehicle = select_vehicle(total_weight, total_distance_km, vehicles)
         
-        render_evolution_plots(screen, best_history, distance_history, show_plot)
+        render_evolution_plots(screen, engine.best_history, engine.distance_history, show_plot)
         
         render_route_list(
             screen, 
@@ -423,18 +417,21 @@ def run_tsp_mode(data, ga_config):
             coord_to_city, 
             deliveries_by_city, 
             distance_lookup, 
-            show_list
+            show_list,
+            data['distance_matrix'],
+            data['city_index']
         )
         
         render_vehicle_info(screen, total_weight, total_distance_km, vehicle, vehicles)
         
-        render_footer(screen, generation, best_fitness, POPULATION_SIZE, fitness, len(best), "TSP")
+        render_footer(screen, generation, best_fitness, len(fitness), fitness, len(best), "TSP",
+                      diversity=engine.diversity.value, restarts=engine.diversity.restarts)
         
         render_map_with_routes(
             screen,
             map_surface,
             best,
-            population,
+            decode_population(population[:4], coords),
             coords,
             cities,
             coord_to_city,
@@ -444,22 +441,17 @@ def run_tsp_mode(data, ga_config):
             show_coordinates
         )
         
-        new_pop = [population[0]]
-        while len(new_pop) < POPULATION_SIZE:
-            p1, p2 = ga_config["selection_fn"](population, fitness)
-            child = ga_config["crossover_fn"](p1, p2)
-            child = ga_config["mutation_fn"](child, MUTATION_RATE)
-            new_pop.append(child)
-        
-        population = new_pop
-        
         pygame.display.flip()
         
-        if generation % 50 == 0:
-            print(f"Geração {generation}: Fitness={best_fitness:.2f}, Distância={total_distance_km:.1f}km, Veículo={vehicle.name if vehicle else 'Nenhum'}")
+        if generation % 50 == 0 and not finished:
+            cache_text = f", Cache={engine.cache_hit_rate:.0%}" if engine.cache_hit_rate is not None else ""
+            print(f"Geração {generation}: Fitness={best_fitness:.2f}, Distância={total_distance_km:.1f}km, Veículo={vehicle.name if vehicle else 'Nenhum'}{cache_text}, Diversidade={engine.diversity.value:.0%}, Reinícios={engine.diversity.restarts}")
+            if engine.adaptive is not None:
+                print_operator_stats(engine.operator_stats())
         
         clock.tick(30)
     
+    engine.close()
     pygame.quit()
 
 
@@ -507,7 +499,10 @@ def run_vrp_mode(data, ga_config, depot_city):
         vehicles,
         ga_config,
         depot_city,
-        VRP_GENERATIONS_PER_ROUTE
+        VRP_GENERATIONS_PER_ROUTE,
+        city_latlng=city_latlng,
+        distance_matrix=data['distance_matrix'],
+        city_index=data['city_index']
     )
     
     pygame.display.set_caption("VRP - São Paulo (Pressione D para Detalhes, E para Exportar)")
@@ -572,7 +567,10 @@ def run_vrp_mode(data, ga_config, depot_city):
                         vehicles,
                         ga_config,
                         depot_city,
-                        VRP_GENERATIONS_PER_ROUTE
+                        VRP_GENERATIONS_PER_ROUTE,
+                        city_latlng=city_latlng,
+                        distance_matrix=data['distance_matrix'],
+                        city_index=data['city_index']
                     )
                     cost_history = initial_history['cost_history'][:]
                     distance_history = initial_history['distance_history'][:]
@@ -608,7 +606,10 @@ def run_vrp_mode(data, ga_config, depot_city):
                 vehicles,
                 ga_config,
                 depot_city,
-                VRP_GENERATIONS_PER_ROUTE // 3
+                VRP_GENERATIONS_PER_ROUTE // 3,
+                city_latlng=city_latlng,
+                distance_matrix=data['distance_matrix'],
+                city_index=data['city_index']
             )
             
             new_cost = sum(r.total_cost for r in new_routes)
@@ -0,0 +1,487 @@
+# tsp_solver.py
+"""
+Motor do AG para o TSP, independente do pygame.
+
+TSPEngine avança uma geração por step() e é usado tanto pela interface
+(run_tsp_mode, que só renderiza o estado) quanto por solve_tsp, que roda
+sem tela e sem limite de frames. Também pode ser executado pela linha de
+comando:
+
+    python tsp_solver.py --time-limit 60 --crossover pmx --output rota.json
+"""
+import sys
+import json
+import random
+import argparse
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import (
+    POPULATION_SIZE,
+    MUTATION_RATE,
+    PRIORITY_WEIGHT,
+    FITNESS_CACHE,
+    FITNESS_CACHE_SIZE,
+    FITNESS_WORKERS,
+    LOCAL_SEARCH_NEIGHBORS,
+    LOCAL_SEARCH_RATE,
+    SEEDING_PERCENT,
+    STEADY_STATE_BATCH,
+    STEADY_STATE_REPLACEMENT,
+    DIVERSITY_THRESHOLD,
+    DIVERSITY_PATIENCE,
+    DIVERSITY_RESTART_FRACTION
+)
+from genetic_algorithm import (
+    generate_seeded_population,
+    build_fitness_context,
+    evaluate_pending,
+    breed_population,
+    steady_state_step,
+    FitnessCache,
+    is_cyclic_invariant,
+    build_neighbor_lists,
+    apply_local_search,
+    polish_tour,
+    score_tour,
+    calculate_tour_distance,
+    sort_population,
+    AdaptiveOperators,
+    DiversityMonitor,
+    population_diversity,
+    inject_immigrants,
+    MUTATION_TYPES,
+    SELECTION_TYPES,
+    CROSSOVER_TYPES,
+    LOCAL_SEARCH_MODES,
+    REPLACEMENT_TYPES
+)
+from parallel_fitness import ParallelEvaluator, resolve_workers
+from island_model import IslandModel
+from termination import TerminationPolicy
+
+
+RUN_MODES = ("single", "islands", "steady")
+OPERATOR_MODES = ("fixed", "adaptive")
+
+
+def make_ga_config(mutation_key: str = "swap",
+                   selection_key: str = "tournament",
+                   crossover_key: str = "ox",
+                   local_search: str = "none",
+                   run_mode: str = "single",
+                   operator_mode: str = "fixed",
+                   replacement: str = STEADY_STATE_REPLACEMENT) -> Dict:
+    """
+    Mesmo formato de configuração retornado por show_ga_menu().
+    replacement só é usado com run_mode "steady".
+    """
+    return validate_ga_config({
+        "mutation_fn": MUTATION_TYPES[mutation_key],
+        "selection_fn": SELECTION_TYPES[selection_key],
+        "crossover_fn": CROSSOVER_TYPES[crossover_key],
+        "mutation_key": mutation_key,
+        "selection_key": selection_key,
+        "crossover_key": crossover_key,
+        "local_search": local_search,
+        "run_mode": run_mode,
+        "operator_mode": operator_mode,
+        "replacement": replacement,
+    })
+
+
+def validate_ga_config(ga_config: Dict) -> Dict:
+    """
+    ValueError para combinações sem suporte: as ilhas usam os operadores fixos
+    de cada ilha, então não aceitam operator_mode "adaptive".
+    """
+    if ga_config.get("run_mode") == "islands" and ga_config.get("operator_mode") == "adaptive":
+        raise ValueError("Operadores adaptativos não são suportados no modo ilhas")
+    return ga_config
+
+
+# =========================
+# MOTOR
+# =========================
+
+class TSPEngine:
+    """
+    Estado de uma execução do AG. Após cada step(), population/fitness são a
+    geração atual avaliada e ordenada (population[0] é o melhor da geração).
+    """
+
+    def __init__(self, data: Dict, ga_config: Dict,
+                 population_size: int = POPULATION_SIZE,
+                 mutation_rate: float = MUTATION_RATE,
+                 seed: Optional[int] = None):
+        self.data = data
+        self.ga_config = validate_ga_config(dict(ga_config))
+        self.ga_config.setdefault("mutation_fn", MUTATION_TYPES[self.ga_config["mutation_key"]])
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.local_search = self.ga_config.get("local_search", "none")
+        self.replacement = None
+        if self.ga_config.get("run_mode") == "steady":
+            self.replacement = self.ga_config.get("replacement", STEADY_STATE_REPLACEMENT)
+
+        # Com seed, a execução é reproduzível (a seleção usa o módulo random)
+        if seed is not None:
+            random.seed(seed)
+        self.rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+        self.context = build_fitness_context(data, priority_weight=PRIORITY_WEIGHT)
+        self.cache = None
+        if FITNESS_CACHE:
+            self.cache = FitnessCache(FITNESS_CACHE_SIZE, canonical=is_cyclic_invariant(self.context))
+        self.evaluator = ParallelEvaluator(self.context, FITNESS_WORKERS)
+        self.neighbors = build_neighbor_lists(self.context.distance_matrix, LOCAL_SEARCH_NEIGHBORS)
+        self.islands = None
+
+        self.reset()
+
+    def reset(self):
+        """Nova população (e novas ilhas, no modo ilhas); zera histórico e melhor solução."""
+        if self.islands is not None:
+            self.islands.close()
+            self.islands = None
+
+        city_latlng = self.data.get('city_latlng_array')
+        if self.ga_config.get("run_mode") == "islands":
+            # Cada step() roda ISLAND_MIGRATION_INTERVAL gerações em cada ilha
+            self.islands = IslandModel(
+                self.context, self.ga_config,
+                population_size=self.population_size,
+                city_latlng=city_latlng,
+                seed=int(self.rng.integers(2**63)),
+                processes=resolve_workers(FITNESS_WORKERS) > 1,
+                mutation_rate=self.mutation_rate
+            )
+            # Cada ilha semeia a própria população; aqui fica a união de todas
+            self.population, self.fitness = self.islands.population, self.islands.fitness
+        else:
+            self.population = generate_seeded_population(
+                self.population_size, self.context, SEEDING_PERCENT, city_latlng, self.rng
+            )
+            self.fitness = np.full(self.population_size, np.nan)
+        # Modo adaptativo: crossover/mutação escolhidos por filho (probability matching)
+        self.adaptive = None
+        if self.ga_config.get("operator_mode") == "adaptive":
+            self.adaptive = AdaptiveOperators()
+        self.diversity = DiversityMonitor(DIVERSITY_THRESHOLD, DIVERSITY_PATIENCE)
+        self.generation = 0
+        self.evaluations = 0
+        self.best_history = []
+        self.distance_history = []
+        self.diversity_history = []
+        self.best_solution = None
+        self.best_fitness = float('inf')
+        self._needs_breeding = False
+
+    def step(self):
+        """
+        Avança uma geração (ou uma rodada de migração no modo ilhas, em que
+        population/fitness são a união das populações de todas as ilhas).
+        No modo steady-state, uma "geração" são lotes suficientes para gerar
+        population_size - 1 filhos; só os filhos são avaliados.
+        """
+        if self.islands is not None:
+            self.population, self.fitness = self.islands.step()
+            # Cada ilha avalia toda a sua população a cada geração (aproximado: ignora o cache)
+            self.evaluations += self.islands.interval * self.population_size * len(self.islands.configs)
+            self.generation = self.islands.generation
+            # Só para exibição: as ilhas mantêm a diversidade pela migração
+            self.diversity.value = population_diversity(self.population)
+        else:
+            if self._needs_breeding and self.replacement is not None:
+                self._steady_state()
+            elif self._needs_breeding:
+                self._breed()
+            self.evaluations += int(np.isnan(self.fitness).sum())
+            self.fitness = evaluate_pending(
+                self.population, self.fitness, self.context, self.cache, self.evaluator
+            )
+            if self.adaptive is not None and self.replacement is None:
+                # Filhos ocupam as linhas após a elite (elite_size=1 em _breed)
+                self.adaptive.credit(self.fitness[1:])
+            self.population, self.fitness = sort_population(self.population, self.fitness)
+
+            if self.local_search == "elite":
+                self.population, self.fitness = apply_local_search(
+                    self.population, self.fitness, self.context, self.neighbors, self.local_search
+                )
+            self.generation += 1
+            self._needs_breeding = True
+
+            if self.diversity.update(self.population):
+                self._restart_partially()
+
+        self.diversity_history.append(self.diversity.value)
+
+        current_best = float(self.fitness[0])
+        self.best_history.append(current_best)
+        self.distance_history.append(calculate_tour_distance(self.population[0], self.context.distance_matrix))
+
+        if current_best < self.best_fitness:
+            self.best_solution = self.population[0].copy()
+            self.best_fitness = current_best
+
+    def _breed(self):
+        self.population = breed_population(
+            self.population, self.fitness, self.ga_config, self.mutation_rate,
+            rng=self.rng, adaptive=self.adaptive
+        )
+        self.fitness = np.concatenate(([self.fitness[0]], np.full(len(self.population) - 1, np.nan)))
+
+        if self.local_search == "offspring":
+            self.population, self.fitness = apply_local_search(
+                self.population, self.fitness, self.context, self.neighbors,
+                self.local_search, LOCAL_SEARCH_RATE
+            )
+
+    def _steady_state(self):
+        neighbors = self.neighbors if self.local_search == "offspring" else None
+        remaining = self.population_size - 1
+        while remaining > 0:
+            batch = min(STEADY_STATE_BATCH, remaining)
+            steady_state_step(
+                self.population, self.fitness, self.ga_config, self.mutation_rate,
+                self.context, batch, self.replacement, self.cache, self.evaluator,
+                self.rng, self.adaptive, neighbors, LOCAL_SEARCH_RATE
+            )
+            self.evaluations += batch
+            remaining -= batch
+
+    def _restart_partially(self):
+        """População convergida: troca a parte pior por imigrantes e já os avalia."""
+        self.population, self.fitness = inject_immigrants(
+            self.population, self.fitness, DIVERSITY_RESTART_FRACTION, self.rng
+        )
+        self.evaluations += int(np.isnan(self.fitness).sum())
+        self.fitness = evaluate_pending(
+            self.population, self.fitness, self.context, self.cache, self.evaluator
+        )
+        self.population, self.fitness = sort_population(self.population, self.fitness)
+
+    def polish_best(self, time_limit: Optional[float] = None) -> Optional[np.ndarray]:
+        """Refinamento final (2-opt + Or-opt) da melhor solução, limitado a time_limit segundos."""
+        if self.best_solution is None:
+            return None
+        self.best_solution, polished = polish_tour(
+            self.best_solution, self.context, self.neighbors, time_limit=time_limit
+        )
+        self.best_fitness = polished.fitness
+        return self.best_solution
+
+    def operator_stats(self) -> Optional[Dict]:
+        """Uso, taxa de sucesso e probabilidade de cada operador (modo adaptativo)."""
+        return self.adaptive.stats() if self.adaptive is not None else None
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        """Taxa de acertos do cache de fitness (None com FITNESS_CACHE desligado)."""
+        return self.cache.hit_rate if self.cache is not None else None
+
+    def close(self):
+        self.evaluator.close()
+        if self.islands is not None:
+            self.islands.close()
+            self.islands = None
+
+
+# =========================
+# API SEM INTERFACE
+# =========================
+
+@dataclass
+class TSPResult:
+    best_tour: np.ndarray          # índices em data['cities']
+    best_fitness: float
+    best_distance: float
+    best_weight: float
+    history: Dict[str, List[float]] = field(default_factory=dict)
+    stats: Dict = field(default_factory=dict)
+
+    def city_names(self, cities: List[str]) -> List[str]:
+        return [cities[i] for i in self.best_tour]
+
+
+def solve_tsp(data: Dict, config: Dict,
+              time_limit: Optional[float] = None,
+              max_generations: Optional[int] = None,
+              seed: Optional[int] = None,
+              polish: bool = True,
+              termination: Optional[TerminationPolicy] = None,
+              on_improvement: Optional[Callable[[np.ndarray, float, int], None]] = None,
+              mutation_rate: float = MUTATION_RATE) -> TSPResult:
+    """
+    Roda o AG sem pygame até a política de parada disparar.
+    config: dicionário no formato de show_ga_menu()/make_ga_config().
+    time_limit (segundos) e max_generations sobrescrevem os de termination, que é
+    copiada (a política do chamador não é alterada).
+    on_improvement(tour, fitness, geração) recebe cada novo melhor tour.
+    mutation_rate vale para todos os modos, inclusive cada ilha.
+    O relógio começa antes de montar o motor; o refinamento final (polish)
+    usa só o tempo que sobrar de time_limit e é pulado se não sobrar nenhum.
+    """
+    overrides = {"time_limit": time_limit, "max_generations": max_generations}
+    termination = replace(termination or TerminationPolicy(),
+                          **{name: value for name, value in overrides.items() if value is not None})
+    if not termination.is_bounded and termination.target_fitness is None and not termination.window:
+        raise ValueError("Defina ao menos um critério de parada (ex.: time_limit ou max_generations)")
+
+    termination.start()
+    engine = TSPEngine(data, config, mutation_rate=mutation_rate, seed=seed)
+
+    try:
+        # Pelo menos uma geração, para sempre haver uma melhor solução
+        while True:
+            previous_best = engine.best_fitness
+            engine.step()
+            if on_improvement is not None and engine.best_fitness < previous_best:
+                on_improvement(engine.best_solution, engine.best_fitness, engine.generation)
+            if termination.should_stop(engine.generation, engine.evaluations, engine.best_fitness):
+                break
+
+        search_time = termination.elapsed
+        remaining = termination.remaining()
+        if polish and (remaining is None or remaining > 0):
+            engine.polish_best(time_limit=remaining)
+        elapsed = termination.elapsed
+    finally:
+        engine.close()
+
+    best_score = score_tour(engine.best_solution, engine.context)
+
+    return TSPResult(
+        best_tour=engine.best_solution,
+        best_fitness=best_score.fitness,
+        best_distance=best_score.distance,
+        best_weight=best_score.weight,
+        history={
+            "fitness": engine.best_history,
+            "distance": engine.distance_history,
+            "diversity": engine.diversity_history
+        },
+        stats={
+            "generations": engine.generation,
+            "evaluations": engine.evaluations,
+            "search_seconds": search_time,
+            "elapsed_seconds": elapsed,
+            "generations_per_second": engine.generation / search_time if search_time > 0 else 0.0,
+            "cache_hit_rate": engine.cache_hit_rate,
+            "stop_reason": termination.reason,
+            "operators": engine.operator_stats(),
+            "restarts": engine.diversity.restarts
+        }
+    )
+
+
+# =========================
+# LINHA DE COMANDO
+# =========================
+
+def print_operator_stats(operator_stats: Dict):
+    """Tabela de uso/sucesso/probabilidade dos operadores adaptativos."""
+    for family, operators in operator_stats.items():
+        print(f"   {family.capitalize()}:")
+        for key, entry in operators.items():
+            print(f"     {key:<10} uso={entry['usage']:<7} sucesso={entry['success_rate']:6.1%} "
+                  f"p={entry['probability']:.2f}")
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Resolve o TSP de entregas sem interface gráfica.")
+    parser.add_argument("--time-limit", type=float, default=None, help="limite de tempo em segundos")
+    parser.add_argument("--generations", type=int, default=None, help="número máximo de gerações")
+    parser.add_argument("--max-evaluations", type=int, default=None, help="número máximo de avaliações")
+    parser.add_argument("--target-fitness", type=float, default=None, help="para ao atingir este fitness")
+    parser.add_argument("--window", type=int, default=None,
+                        help="para se a melhora relativa em WINDOW gerações for menor que --min-improvement")
+    parser.add_argument("--min-improvement", type=float, default=1e-3)
+    parser.add_argument("--mutation", choices=list(MUTATION_TYPES), default="swap")
+    parser.add_argument("--selection", choices=list(SELECTION_TYPES), default="tournament")
+    parser.add_argument("--crossover", choices=list(CROSSOVER_TYPES), default="ox")
+    parser.add_argument("--local-search", choices=list(LOCAL_SEARCH_MODES), default="none")
+    parser.add_argument("--islands", action="store_true", help="usa o modelo de ilhas")
+    parser.add_argument("--steady-state", choices=list(REPLACEMENT_TYPES), default=None,
+                        help="substituição steady-state (pior indivíduo ou mais similar)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="escolhe crossover/mutação adaptativamente a cada geração (incompatível com --islands)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-polish", action="store_true", help="não refina a melhor rota no final")
+    parser.add_argument("--output", default=None, help="arquivo JSON com a rota e as estatísticas")
+    args = parser.parse_args(argv)
+
+    if args.time_limit is None and args.generations is None and args.max_evaluations is None:
+        parser.error("informe --time-limit, --generations ou --max-evaluations")
+    if args.adaptive and args.islands:
+        parser.error("--adaptive não pode ser usado com --islands")
+    return args
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+
+    from loader_resources.data_loader import load_all_data
+    data = load_all_data(build_map=False)
+
+    config = make_ga_config(
+        mutation_key=args.mutation,
+        selection_key=args.selection,
+        crossover_key=args.crossover,
+        local_search=args.local_search,
+        run_mode="islands" if args.islands else "steady" if args.steady_state else "single",
+        operator_mode="adaptive" if args.adaptive else "fixed",
+        replacement=args.steady_state or STEADY_STATE_REPLACEMENT
+    )
+
+    termination = TerminationPolicy(
+        time_limit=args.time_limit,
+        max_generations=args.generations,
+        max_evaluations=args.max_evaluations,
+        target_fitness=args.target_fitness,
+        window=args.window,
+        min_improvement=args.min_improvement
+    )
+
+    def report(tour, fitness, generation):
+        print(f"   Geração {generation}: novo melhor fitness {fitness:.2f}")
+
+    result = solve_tsp(
+        data, config,
+        seed=args.seed,
+        polish=not args.no_polish,
+        termination=termination,
+        on_improvement=report
+    )
+
+    stats = result.stats
+    print(f"\n✅ {stats['generations']} gerações em {stats['search_seconds']:.1f}s "
+          f"({stats['generations_per_second']:.0f} ger/s, {stats['evaluations']} avaliações)")
+    print(f"   Parada: {stats['stop_reason']} | Reinícios parciais: {stats['restarts']}")
+    if stats["operators"]:
+        print_operator_stats(stats["operators"])
+    print(f"   Fitness: {result.best_fitness:.2f} | Distância: {result.best_distance:.1f}km | "
+          f"Peso: {result.best_weight:.1f}kg")
+    print("   Rota: " + " → ".join(result.city_names(data['cities'])))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "route": result.city_names(data['cities']),
+                "fitness": result.best_fitness,
+                "distance_km": result.best_distance,
+                "weight_kg": result.best_weight,
+                "config": {k: v for k, v in config.items() if not k.endswith("_fn")},
+                "stats": stats,
+                "history": result.history
+            }, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultado salvo em {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,7 +48,7 @@ def show_ga_menu():
     pygame.init()
     
     WIDTH = 600
-    HEIGHT = 500
+    HEIGHT = 860
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Configuração do Algoritmo Genético")
     
@@ -57,9 +57,11 @@ def show_ga_menu():
     font_small = pygame.font.SysFont("Arial", 14)
     
     mutation_buttons = [
-        Button(50, 100, 150, 50, "Swap", "swap"),
-        Button(225, 100, 150, 50, "Inversion", "inversion"),
-        Button(400, 100, 150, 50, "Scramble", "scramble")
+        Button(30, 100, 100, 50, "Swap", "swap"),
+        Button(140, 100, 100, 50, "Inversion", "inversion"),
+        Button(250, 100, 100, 50, "Scramble", "scramble"),
+        Button(360, 100, 100, 50, "Or-opt", "or_opt"),
+        Button(470, 100, 100, 50, "Or-2opt", "or2opt")
     ]
     mutation_buttons[0].selected = True
     
@@ -71,13 +73,34 @@ def show_ga_menu():
     selection_buttons[0].selected = True
     
     crossover_buttons = [
-        Button(50, 340, 150, 50, "Order (OX)", "ox"),
-        Button(225, 340, 150, 50, "PMX", "pmx"),
-        Button(400, 340, 150, 50, "Cycle (CX)", "cx")
+        Button(30, 340, 125, 50, "Order (OX)", "ox"),
+        Button(170, 340, 125, 50, "PMX", "pmx"),
+        Button(310, 340, 125, 50, "Cycle (CX)", "cx"),
+        Button(450, 340, 125, 50, "Edge (ERX)", "erx")
     ]
     crossover_buttons[0].selected = True
     
-    start_button = Button(200, 430, 200, 50, "INICIAR", "start")
+    local_search_buttons = [
+        Button(50, 460, 150, 50, "Nenhuma", "none"),
+        Button(225, 460, 150, 50, "2-opt (Filhos)", "offspring"),
+        Button(400, 460, 150, 50, "2-opt (Elite)", "elite")
+    ]
+    local_search_buttons[0].selected = True
+    
+    run_mode_buttons = [
+        Button(30, 580, 170, 50, "População Única", "single"),
+        Button(215, 580, 170, 50, "Ilhas (Multiprocesso)", "islands"),
+        Button(400, 580, 170, 50, "Steady-State", "steady")
+    ]
+    run_mode_buttons[0].selected = True
+    
+    operator_mode_buttons = [
+        Button(100, 700, 190, 50, "Fixos (acima)", "fixed"),
+        Button(310, 700, 190, 50, "Adaptativos", "adaptive")
+    ]
+    operator_mode_buttons[0].selected = True
+    
+    start_button = Button(200, 790, 200, 50, "INICIAR", "start")
     
     clock = pygame.time.Clock()
     running = True
@@ -110,6 +133,32 @@ def show_ga_menu():
                             b.selected = False
                         btn.selected = True
                 
+                for btn in local_search_buttons:
+                    if btn.is_clicked(pos):
+                        for b in local_search_buttons:
+                            b.selected = False
+                        btn.selected = True
+                
+                for btn in run_mode_buttons:
+                    if btn.is_clicked(pos):
+                        for b in run_mode_buttons:
+                            b.selected = False
+                        btn.selected = True
+                
+                # Ilhas só aceitam operadores fixos: "Adaptativos" fica oculto
+                islands_mode = any(b.selected and b.value == "islands" for b in run_mode_buttons)
+                if islands_mode:
+                    for b in operator_mode_buttons:
+                        b.selected = b.value == "fixed"
+                
+                for btn in operator_mode_buttons:
+                    if islands_mode and btn.value == "adaptive":
+                        continue
+                    if btn.is_clicked(pos):
+                        for b in operator_mode_buttons:
+                            b.selected = False
+                        btn.selected = True
+                
                 if start_button.is_clicked(pos):
                     running = False
             
@@ -131,6 +180,15 @@ def show_ga_menu():
         crossover_label = font_normal.render("Tipo de Crossover:", True, BLACK)
         screen.blit(crossover_label, (50, 310))
         
+        local_search_label = font_normal.render("Busca Local:", True, BLACK)
+        screen.blit(local_search_label, (50, 430))
+        
+        run_mode_label = font_normal.render("Execução:", True, BLACK)
+        screen.blit(run_mode_label, (50, 550))
+        
+        operator_mode_label = font_normal.render("Operadores (Crossover/Mutação):", True, BLACK)
+        screen.blit(operator_mode_label, (50, 670))
+        
         for btn in mutation_buttons:
             btn.draw(screen, font_small)
         
@@ -140,6 +198,17 @@ def show_ga_menu():
         for btn in crossover_buttons:
             btn.draw(screen, font_small)
         
+        for btn in local_search_buttons:
+            btn.draw(screen, font_small)
+        
+        for btn in run_mode_buttons:
+            btn.draw(screen, font_small)
+        
+        for btn in operator_mode_buttons:
+            if btn.value == "adaptive" and any(b.selected and b.value == "islands" for b in run_mode_buttons):
+                continue
+            btn.draw(screen, font_small)
+        
         pygame.draw.rect(screen, GREEN, start_button.rect)
         pygame.draw.rect(screen, BLACK, start_button.rect, 2)
         start_text = font_normal.render(start_button.text, True, WHITE)
@@ -147,7 +216,7 @@ def show_ga_menu():
         screen.blit(start_text, start_text_rect)
         
         hint = font_small.render("Clique nas opções ou pressione ENTER para iniciar", True, DARK_GRAY)
-        screen.blit(hint, (WIDTH//2 - hint.get_width()//2, 405))
+        screen.blit(hint, (WIDTH//2 - hint.get_width()//2, 765))
         
         pygame.display.flip()
         clock.tick(30)
@@ -155,6 +224,9 @@ def show_ga_menu():
     mutation_key = next(btn.value for btn in mutation_buttons if btn.selected)
     selection_key = next(btn.value for btn in selection_buttons if btn.selected)
     crossover_key = next(btn.value for btn in crossover_buttons if btn.selected)
+    local_search_key = next(btn.value for btn in local_search_buttons if btn.selected)
+    run_mode_key = next(btn.value for btn in run_mode_buttons if btn.selected)
+    operator_mode_key = next(btn.value for btn in operator_mode_buttons if btn.selected)
     
     pygame.display.quit()
     pygame.display.init()
@@ -162,7 +234,10 @@ def show_ga_menu():
     print(f"\n✓ Configurações escolhidas:")
     print(f"  Mutação: {mutation_key}")
     print(f"  Seleção: {selection_key}")
-    print(f"  Crossover: {crossover_key}\n")
+    print(f"  Crossover: {crossover_key}")
+    print(f"  Busca local: {local_search_key}")
+    print(f"  Execução: {run_mode_key}")
+    print(f"  Operadores: {operator_mode_key}\n")
     
     return {
         "mutation_fn": MUTATION_TYPES[mutation_key],
@@ -171,4 +246,7 @@ def show_ga_menu():
         "mutation_key": mutation_key,
         "selection_key": selection_key,
         "crossover_key": crossover_key,
+        "local_search": local_search_key,
+        "run_mode": run_mode_key,
+        "operator_mode": operator_mode_key,
     }
\ No newline at end of file
@@ -1,6 +1,7 @@
 # ui_renderer.py
 
 import pygame
+import numpy as np
 from typing import List, Tuple, Dict, Optional
 from config import *
 from draw_functions import draw_plot, draw_paths
@@ -104,9 +105,13 @@ def render_route_list(screen: pygame.Surface,
                      coord_to_city: Dict[Tuple[int, int], str],
                      deliveries_by_city: Dict,
                      distance_lookup: Dict[Tuple[str, str], float],
-                     show_list: bool):
+                     show_list: bool,
+                     distance_matrix: Optional[np.ndarray] = None,
+                     city_index: Optional[Dict[str, int]] = None):
     """
     Renderiza a lista de cidades da melhor rota.
+    Com distance_matrix e city_index as distâncias parciais saem de uma soma
+    acumulada por índice em vez de recalcular cada prefixo pelo dicionário.
     """
     if not show_list:
         return
@@ -127,6 +132,13 @@ def render_route_list(screen: pygame.Surface,
 
     max_cities = min(len(best_route), 15)
     
+    # Distância do prefixo fechado (volta à primeira cidade), como calculate_route_distance
+    prefix_distances = None
+    if distance_matrix is not None and city_index is not None and max_cities > 1:
+        idx = np.array([city_index[coord_to_city[c]] for c in best_route[:max_cities]], dtype=np.intp)
+        legs = np.cumsum(distance_matrix[idx[:-1], idx[1:]])
+        prefix_distances = legs + distance_matrix[idx[1:], idx[0]]
+    
     for i in range(max_cities):
         coord = best_route[i]
         city = coord_to_city[coord]
@@ -148,8 +160,11 @@ def render_route_list(screen: pygame.Surface,
         pygame.draw.circle(clip, priority_color, (150, y + 7), 4)
         
         if i > 0:
-            sub_route = best_route[:i+1]
-            dist = calculate_route_distance(sub_route, coord_to_city, distance_lookup)
+            if prefix_distances is not None:
+                dist = prefix_distances[i - 1]
+            else:
+                sub_route = best_route[:i+1]
+                dist = calculate_route_distance(sub_route, coord_to_city, distance_lookup)
             dist_text = f"{dist:.0f}km"
             dist_txt = small_font.render(dist_text, True, (100, 100, 100))
             clip.blit(dist_txt, (INFO_WIDTH - 70, y))
@@ -733,7 +748,9 @@ def render_footer(
     fitness_list: list,
     num_cities: int,
     mode: str = "TSP",
-    show_initial_search: bool = False
+    show_initial_search: bool = False,
+    diversity: Optional[float] = None,
+    restarts: int = 0
 ):
     small_font = pygame.font.SysFont("Arial", 12)
 
@@ -742,11 +759,15 @@ def render_footer(
     pygame.draw.rect(screen, BLACK, footer_bg, 1)
 
     if mode == "TSP":
+        cities_line = f"Cidades na rota: {num_cities}"
+        if diversity is not None:
+            cities_line += f" | Diversidade: {diversity:.0%} ({restarts} reinícios)"
+
         footer_lines = [
             f"Geração: {generation}",
             f"Melhor fitness: {best_fitness:.2f}",
             f"Rotas viáveis: {sum(1 for f in fitness_list if f < 10000)}/{population_size}",
-            f"Cidades na rota: {num_cities}",
+            cities_line,
             "Controles:",
             "E=Gerar arquivo com solução",
             "G=gráficos  L=lista  T=tentativas",
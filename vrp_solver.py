@@ -1,9 +1,11 @@
 # vrp_solver.py - VERSÃO ÚNICA E CORRETA
 import random
 import math
+import itertools
 from typing import List, Tuple, Dict, Optional, Set
 from dataclasses import dataclass
-from copy import deepcopy
+
+import numpy as np
 
 from genetic_algorithm import (
     calculate_route_distance,
@@ -11,7 +13,20 @@ from genetic_algorithm import (
     calculate_priority_penalty
 )
 
-from config import POPULATION_SIZE, MUTATION_RATE
+from loader_resources.city_loader import build_distance_matrix
+from parallel_fitness import ParallelVRPEvaluator
+from termination import TerminationPolicy
+from giant_tour import solve_vrp_giant_tour
+from route_construction import (
+    build_routing_data,
+    build_savings_solution,
+    build_sweep_solution,
+    polar_angles
+)
+from config import (
+    POPULATION_SIZE, MUTATION_RATE, VRP_ENGINE,
+    VRP_SEEDING_PERCENT, VRP_SAVINGS_NOISE
+)
 
 
 # =========================
@@ -44,6 +59,82 @@ class VRPOptions:
 # =========================
 # ESTRUTURAS
 # =========================
+ROUTE_STAT_FIELDS = (
+    'total_distance', 'total_weight', 'total_cost', 'max_priority', 'avg_priority',
+    'cities', 'priority_score', 'weight_violation', 'distance_violation', 'is_feasible'
+)
+
+
+def _tracked(name):
+    method = getattr(list, name)
+    
+    def mutator(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    
+    mutator.__name__ = name
+    return mutator
+
+
+def _restore_route_list(items, version):
+    route = RouteList(items)
+    route.version = version
+    return route
+
+
+class RouteList(list):
+    """
+    Lista de coordenadas de uma rota. Toda operação que altera a lista
+    incrementa `version`, usado por VRPRoute para saber se as estatísticas
+    ainda valem. Cópias (pickle/deepcopy) preservam a versão.
+    """
+    version = 0
+    
+    def __reduce__(self):
+        return _restore_route_list, (list(self), self.version)
+    
+    append = _tracked("append")
+    extend = _tracked("extend")
+    insert = _tracked("insert")
+    remove = _tracked("remove")
+    pop = _tracked("pop")
+    clear = _tracked("clear")
+    sort = _tracked("sort")
+    reverse = _tracked("reverse")
+    __setitem__ = _tracked("__setitem__")
+    __delitem__ = _tracked("__delitem__")
+    __iadd__ = _tracked("__iadd__")
+    __imul__ = _tracked("__imul__")
+
+
+class _StatsInput:
+    """
+    Descritor dos atributos de que as estatísticas dependem: alterá-los
+    marca a rota como suja. `route` é sempre guardada como RouteList.
+    O valor fica no __dict__ da instância, com o mesmo nome.
+    """
+    def __init__(self, name):
+        self.name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__[self.name]
+    
+    def __set__(self, instance, value):
+        state = instance.__dict__
+        if self.name == 'route':
+            if not isinstance(value, RouteList):
+                value = RouteList(value)
+            state['_stats_version'] = None
+        elif state.get(self.name, value) != value:
+            state['_stats_version'] = None
+        state[self.name] = value
+
+
+ROUTE_STAT_INPUTS = ('vehicle', 'route', 'depot_coord')
+
+
 @dataclass
 class VRPRoute:
     vehicle: object
@@ -62,8 +153,42 @@ class VRPRoute:
         self.distance_violation = 0.0
         self.is_feasible = True
     
-    def calculate_stats(self, coord_to_city, deliveries_by_city, distance_lookup):
-        if not self.route:
+    def stats(self) -> Dict:
+        """Estatísticas preenchidas por calculate_stats (sem veículo e rota)."""
+        return {name: getattr(self, name) for name in ROUTE_STAT_FIELDS}
+    
+    @property
+    def is_dirty(self) -> bool:
+        """True se rota, veículo ou depósito mudaram desde o último calculate_stats."""
+        return self._stats_version is None or self._stats_version != self.route.version
+    
+    def apply_stats(self, stats: Dict):
+        """Aplica estatísticas calculadas fora (ex.: worker) e marca a rota como limpa."""
+        self.__dict__.update(stats)
+        self._stats_version = self.route.version
+    
+    def copy(self) -> "VRPRoute":
+        """Cópia com lista própria; estatísticas válidas são herdadas."""
+        clone = VRPRoute(self.vehicle, list(self.route), self.depot_coord)
+        if not self.is_dirty:
+            clone.apply_stats(self.stats())
+        return clone
+    
+    def calculate_stats(self, coord_to_city, deliveries_by_city, distance_lookup,
+                        distance_matrix=None, city_index=None):
+        """
+        Recalcula as estatísticas só se a rota mudou desde o último cálculo.
+        Com distance_matrix e city_index as distâncias vêm da matriz por índice.
+        """
+        if self.is_dirty:
+            self._compute_stats(coord_to_city, deliveries_by_city, distance_lookup,
+                                distance_matrix, city_index)
+            self._stats_version = self.route.version
+    
+    def _compute_stats(self, coord_to_city, deliveries_by_city, distance_lookup,
+                       distance_matrix=None, city_index=None):
+        route = self.route
+        if not route:
             self.total_distance = 0.0
             self.total_weight = 0.0
             self.total_cost = 0.0
@@ -76,18 +201,18 @@ class VRPRoute:
         
         # Distância
         if self.depot_coord:
-            full_route = [self.depot_coord] + self.route + [self.depot_coord]
+            full_route = [self.depot_coord] + route + [self.depot_coord]
             self.total_distance = calculate_route_distance(
-                full_route, coord_to_city, distance_lookup
+                full_route, coord_to_city, distance_lookup, distance_matrix, city_index
             )
         else:
             self.total_distance = calculate_route_distance(
-                self.route, coord_to_city, distance_lookup
+                route, coord_to_city, distance_lookup, distance_matrix, city_index
             )
         
         # Peso
         self.total_weight = calculate_route_weight(
-            self.route, coord_to_city, deliveries_by_city
+            route, coord_to_city, deliveries_by_city
         )
         
         # Custo
@@ -102,14 +227,15 @@ class VRPRoute:
         priorities = []
         self.cities = set()
         priority_positions = []
+        last_position = max(1, len(route) - 1)
         
-        for position, coord in enumerate(self.route):
+        for position, coord in enumerate(route):
             city = coord_to_city.get(coord)
             self.cities.add(city)
             if city and city in deliveries_by_city:
                 for d in deliveries_by_city[city]:
                     priorities.append(d.priority)
-                    normalized_position = position / max(1, len(self.route) - 1)
+                    normalized_position = position / last_position
                     priority_positions.append((d.priority, normalized_position))
         
         if priorities:
@@ -131,6 +257,54 @@ class VRPRoute:
             self.priority_score = 0.0
 
 
+# Instalados depois do @dataclass para não virarem valores padrão dos campos
+for _name in ROUTE_STAT_INPUTS:
+    setattr(VRPRoute, _name, _StatsInput(_name))
+
+
+class SolutionSnapshot:
+    """
+    Cópia compacta de uma solução VRP: ids dos veículos, índices das cidades
+    (em cities_coords) de todas as rotas num único array e as estatísticas
+    já calculadas de cada rota. Substitui deepcopy da melhor solução;
+    materialize() reconstrói os VRPRoute sem recalcular as estatísticas.
+    """
+    __slots__ = ('vehicle_ids', 'depot_coords', 'order', 'bounds', 'stats',
+                 'total_cost', 'total_distance', 'active_routes', 'is_feasible')
+    
+    def __init__(self, solution, coord_index: Dict):
+        self.vehicle_ids = tuple(route.vehicle.vehicle_id for route in solution)
+        self.depot_coords = tuple(route.depot_coord for route in solution)
+        self.bounds = np.cumsum([0] + [len(route.route) for route in solution])
+        self.order = np.fromiter(
+            (coord_index[coord] for route in solution for coord in route.route),
+            dtype=np.intp, count=int(self.bounds[-1])
+        )
+        # Rotas sujas não têm estatísticas válidas para guardar
+        self.stats = tuple(None if route.is_dirty else route.stats() for route in solution)
+        
+        active = [route for route in solution if route.route]
+        self.total_cost = sum(route.total_cost for route in active)
+        self.total_distance = sum(route.total_distance for route in active)
+        self.active_routes = len(active)
+        self.is_feasible = all(route.is_feasible for route in solution)
+    
+    @property
+    def total_cities(self) -> int:
+        return len(self.order)
+    
+    def materialize(self, vehicles_by_id: Dict, cities_coords: List) -> List[VRPRoute]:
+        """Novos VRPRoute (listas próprias) com as estatísticas do snapshot."""
+        solution = []
+        for k, vehicle_id in enumerate(self.vehicle_ids):
+            coords = [cities_coords[i] for i in self.order[self.bounds[k]:self.bounds[k + 1]].tolist()]
+            route = VRPRoute(vehicles_by_id[vehicle_id], coords, self.depot_coords[k])
+            if self.stats[k] is not None:
+                route.apply_stats(self.stats[k])
+            solution.append(route)
+        return solution
+
+
 # =========================
 # FUNÇÕES AUXILIARES
 # =========================
@@ -191,6 +365,60 @@ def build_solution_by_priority(cities_coords, vehicles, depot_coord, coord_to_ci
     return solution
 
 
+def build_seeded_solutions(cities_coords, coord_to_city, deliveries_by_city,
+                           distance_lookup, vehicles, depot_coord, count,
+                           city_latlng=None):
+    """
+    Até `count` soluções construtivas, nas proporções de VRP_SEEDING_PERCENT
+    (relativas a POPULATION_SIZE). A primeira semente de economias é
+    determinística; as demais perturbam as economias em VRP_SAVINGS_NOISE.
+    As varreduras polares usam city_latlng ({cidade: (lat, lng)}) em torno do
+    depósito, ou as coordenadas de tela sem ele, começando em cidades
+    espaçadas na ordem angular (o depósito costuma ficar na borda, então
+    ângulos uniformes cairiam no mesmo vão) e com sentido alternado.
+    Sementes repetidas são descartadas.
+    """
+    if depot_coord is None or count <= 0:
+        return []
+    
+    data = build_routing_data(cities_coords, coord_to_city, deliveries_by_city,
+                              distance_lookup, vehicles, depot_coord)
+    rng = np.random.default_rng(random.getrandbits(64))
+    
+    seeds, seen = [], set()
+    
+    def add_seed(solution):
+        key = tuple((route.vehicle.vehicle_id, tuple(route.route)) for route in solution)
+        if key not in seen:
+            seen.add(key)
+            seeds.append(solution)
+    
+    savings_count = POPULATION_SIZE * VRP_SEEDING_PERCENT.get("savings", 0) // 100
+    for k in range(min(savings_count, count)):
+        noise = 0.0 if k == 0 else VRP_SAVINGS_NOISE
+        add_seed(build_savings_solution(data, noise, rng))
+    
+    sweep_count = min(
+        POPULATION_SIZE * VRP_SEEDING_PERCENT.get("sweep", 0) // 100,
+        count - len(seeds)
+    )
+    if sweep_count > 0:
+        if city_latlng is not None:
+            points = [city_latlng[coord_to_city[coord]] for coord in cities_coords]
+            angles = polar_angles(points, city_latlng[coord_to_city[depot_coord]])
+        else:
+            angles = polar_angles(cities_coords, depot_coord, geographic=False)
+        
+        # Cada varredura começa numa cidade; posições espaçadas na ordem angular
+        ranked = np.sort(angles)
+        first = int(rng.integers(len(ranked)))
+        for k in range(sweep_count):
+            start = ranked[(first + k * len(ranked) // sweep_count) % len(ranked)]
+            add_seed(build_sweep_solution(data, angles, start, clockwise=bool(k % 2)))
+    
+    return seeds
+
+
 # =========================
 # FUNÇÃO FITNESS COM PENALIDADES FORTES
 # =========================
@@ -311,10 +539,8 @@ def adaptive_crossover(parent_a, parent_b, depot_coord, options, generation, max
     # Todas as cidades
     all_cities = set(city_to_vehicle_a.keys()) | set(city_to_vehicle_b.keys())
     
-    # Criar rotas filhas
-    child_routes = {}
-    for vehicle_id, vehicle in all_vehicles.items():
-        child_routes[vehicle_id] = VRPRoute(vehicle, [], depot_coord)
+    # Criar rotas filhas (listas simples; VRPRoute só no final)
+    child_routes = {vehicle_id: [] for vehicle_id in all_vehicles}
     
     # Atribuir cidades (50% de chance de herdar de cada pai)
     for city in all_cities:
@@ -329,10 +555,11 @@ def adaptive_crossover(parent_a, parent_b, depot_coord, options, generation, max
             chosen_vehicle = city_to_vehicle_b[city]
         
         if chosen_vehicle in child_routes:
-            child_routes[chosen_vehicle].route.append(city)
+            child_routes[chosen_vehicle].append(city)
     
     # Garantir todas as cidades
-    result = [route for route in child_routes.values() if route.route]
+    result = [VRPRoute(all_vehicles[vehicle_id], cities, depot_coord)
+              for vehicle_id, cities in child_routes.items() if cities]
     
     cities_in_child = set()
     for route in result:
@@ -348,12 +575,15 @@ def adaptive_crossover(parent_a, parent_b, depot_coord, options, generation, max
 
 
 def feasibility_mutation(solution, depot_coord, options, generation,
-                        coord_to_city, deliveries_by_city, distance_lookup):
+                        coord_to_city, deliveries_by_city, distance_lookup,
+                        distance_matrix=None, city_index=None):
     """Mutação especial para corrigir violações."""
     new_solution = []
     for route in solution:
-        new_route = VRPRoute(route.vehicle, route.route[:], depot_coord)
-        new_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup)
+        new_route = route.copy()
+        new_route.depot_coord = depot_coord
+        new_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup,
+                                  distance_matrix, city_index)
         new_solution.append(new_route)
     
     # Taxa de mutação aumentada se houver violações
@@ -456,7 +686,27 @@ def optimize_route_order(route_coords, coord_to_city, deliveries_by_city):
     return sorted(route_coords, key=lambda c: city_priority[c])
 
 
-def force_feasibility(solution, vehicles, depot_coord, coord_to_city, deliveries_by_city, distance_lookup):
+def route_distance_matrix(cities_coords, depot_coord, coord_to_city, distance_lookup,
+                          distance_matrix=None, city_index=None):
+    """
+    Distâncias por índice para VRPRoute.calculate_stats: (linhas da matriz
+    como listas, cidade -> índice). Usa a matriz de load_all_data se cobrir
+    todas as cidades e o depósito; senão a monta a partir de distance_lookup.
+    As rotas do VRP são curtas, então o acesso escalar em listas Python sai
+    mais barato que o gather NumPy.
+    """
+    names = {coord_to_city[coord] for coord in cities_coords}
+    if depot_coord is not None:
+        names.add(coord_to_city[depot_coord])
+    
+    if distance_matrix is None or city_index is None or not names <= city_index.keys():
+        distance_matrix, city_index = build_distance_matrix(sorted(names), distance_lookup)
+    
+    return np.asarray(distance_matrix).tolist(), city_index
+
+
+def force_feasibility(solution, vehicles, depot_coord, coord_to_city, deliveries_by_city, distance_lookup,
+                      distance_matrix=None, city_index=None):
     """Força viabilidade redistribuindo cidades."""
     print("  Aplicando correções de viabilidade...")
     
@@ -490,7 +740,7 @@ def force_feasibility(solution, vehicles, depot_coord, coord_to_city, deliveries
         
         if current_route:
             new_route = VRPRoute(vehicle, current_route, depot_coord)
-            new_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup)
+            new_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup, distance_matrix, city_index)
             new_solution.append(new_route)
     
     # Se sobrou cidades, distribuir
@@ -510,14 +760,14 @@ def force_feasibility(solution, vehicles, depot_coord, coord_to_city, deliveries
         
         if best_route:
             best_route.route.append(city)
-            best_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup)
+            best_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup, distance_matrix, city_index)
         else:
             # Criar nova rota se necessário
             available_vehicles = [v for v in vehicles_sorted 
                                 if v.vehicle_id not in {r.vehicle.vehicle_id for r in new_solution}]
             if available_vehicles:
                 new_route = VRPRoute(available_vehicles[0], [city], depot_coord)
-                new_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup)
+                new_route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup, distance_matrix, city_index)
                 new_solution.append(new_route)
     
     return new_solution
@@ -528,7 +778,33 @@ def force_feasibility(solution, vehicles, depot_coord, coord_to_city, deliveries
 # =========================
 def solve_vrp(cities_coords, coord_to_city, deliveries_by_city,
              distance_lookup, vehicles, ga_config,
-             depot_city=None, generations_per_route=150):
+             depot_city=None, generations_per_route=150,
+             termination=None, on_improvement=None, city_latlng=None,
+             distance_matrix=None, city_index=None):
+    """
+    AG para o VRP. Para pela política `termination` (padrão: TERMINATION_* do
+    config com max_generations=generations_per_route); generations_per_route
+    também é o horizonte do agendamento de pesos/taxas por geração.
+    on_improvement(solução, fitness, geração) recebe cada nova melhor solução.
+    ga_config["vrp_engine"] (padrão VRP_ENGINE) = "giant_tour" usa solve_vrp_giant_tour.
+    city_latlng ({cidade: (lat, lng)}) orienta as sementes de varredura polar.
+    distance_matrix e city_index (de load_all_data) servem às distâncias das
+    rotas; sem eles, ou se não cobrirem as cidades, a matriz é montada aqui.
+    """
+    if ga_config.get("vrp_engine", VRP_ENGINE) == "giant_tour":
+        try:
+            return solve_vrp_giant_tour(
+                cities_coords, coord_to_city, deliveries_by_city, distance_lookup,
+                vehicles, ga_config, depot_city, generations_per_route,
+                termination, on_improvement,
+                distance_matrix=distance_matrix, city_index=city_index
+            )
+        except ValueError as e:
+            print(f"⚠️  Giant tour indisponível ({e}); usando o motor de rotas")
+    
+    if termination is None:
+        termination = TerminationPolicy.from_config(max_generations=generations_per_route)
+    termination.start()
     
     print("\n🚀 VRP COM FORÇAÇÃO DE VIABILIDADE")
     print(f"📍 Cidades: {len(cities_coords)}")
@@ -547,21 +823,33 @@ def solve_vrp(cities_coords, coord_to_city, deliveries_by_city,
         print(f"🏭 Depósito: {depot_city}")
     
     all_cities_set = set(cities_coords)
+    distance_matrix, city_index = route_distance_matrix(
+        cities_coords, depot_coord, coord_to_city, distance_lookup, distance_matrix, city_index
+    )
     
     # Ordenar veículos por capacidade
     vehicles_sorted = sorted(vehicles, key=lambda v: v.max_weight, reverse=True)
     
-    # População inicial
-    population = []
+    evaluator = ParallelVRPEvaluator(
+        coord_to_city, deliveries_by_city, distance_lookup, all_cities_set, options,
+        distance_matrix=distance_matrix, city_index=city_index
+    )
+    
+    # População inicial: sementes construtivas + padrões simples
+    population = build_seeded_solutions(
+        cities_coords, coord_to_city, deliveries_by_city, distance_lookup,
+        vehicles_sorted, depot_coord, POPULATION_SIZE, city_latlng
+    )
     cost_history = []
     distance_history = []
     
-    for i in range(POPULATION_SIZE):
+    remaining = POPULATION_SIZE - len(population)
+    for i in range(remaining):
         # Diversidade na população inicial
-        if i < POPULATION_SIZE // 3:
+        if i < remaining // 3:
             # 1 veículo grande
             solution = [VRPRoute(vehicles_sorted[0], cities_coords[:], depot_coord)]
-        elif i < 2 * POPULATION_SIZE // 3:
+        elif i < 2 * remaining // 3:
             # 2 veículos
             if len(vehicles_sorted) >= 2:
                 split_point = len(cities_coords) // 2
@@ -579,27 +867,30 @@ def solve_vrp(cities_coords, coord_to_city, deliveries_by_city,
         
         population.append(solution)
     
+    # Melhor solução guardada como snapshot (índices em cities_coords)
+    coord_index = {coord: i for i, coord in enumerate(cities_coords)}
+    vehicles_by_id = {v.vehicle_id: v for v in vehicles}
+    
     # Evolução
-    best_solution = None
+    best_snapshot = None
     best_fitness = float('inf')
     stagnation_counter = 0
     feasible_found = False
     
-    for gen in range(generations_per_route):
-        # 1. Avaliar população
+    evaluations = 0
+    
+    for gen in itertools.count():
+        # Progresso do agendamento limitado a 1 quando a parada é por tempo/avaliações
+        schedule_gen = min(gen, generations_per_route)
+        
+        # 1. Avaliar população (stats das rotas + fitness, em paralelo se configurado)
         fitness_scores = []
         feasible_count = 0
         
-        for solution in population:
-            # Calcular stats
-            for route in solution:
-                route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup)
-            
-            # Fitness
-            fitness = calculate_vrp_fitness(
-                solution, coord_to_city, deliveries_by_city,
-                distance_lookup, all_cities_set, options, gen, generations_per_route
-            )
+        population_fitness = evaluator.evaluate(population, schedule_gen, generations_per_route)
+        evaluations += len(population)
+        
+        for fitness, solution in zip(population_fitness, population):
             fitness_scores.append((fitness, solution))
             
             # Contar soluções viáveis
@@ -614,34 +905,40 @@ def solve_vrp(cities_coords, coord_to_city, deliveries_by_city,
         current_best = fitness_scores[0][0]
         if current_best < best_fitness:
             best_fitness = current_best
-            best_solution = deepcopy(fitness_scores[0][1])
+            best_snapshot = SolutionSnapshot(fitness_scores[0][1], coord_index)
             stagnation_counter = 0
             
             # Verificar viabilidade
-            is_best_feasible = all(route.is_feasible for route in best_solution)
+            is_best_feasible = best_snapshot.is_feasible
             if is_best_feasible and not feasible_found:
                 feasible_found = True
                 print(f"🌟 Solução viável encontrada na geração {gen}")
             
             if gen % 10 == 0 or gen < 20:
-                active = sum(1 for r in best_solution if r.route)
-                total_cities = sum(len(r.route) for r in best_solution)
+                active = best_snapshot.active_routes
+                total_cities = best_snapshot.total_cities
                 feasible_status = "✅" if is_best_feasible else "❌"
                 print(f"Gen {gen:3d} | Fit: {best_fitness:8.0f} | V: {active} | C: {total_cities} | {feasible_status}")
+            
+            if on_improvement is not None:
+                on_improvement(best_snapshot.materialize(vehicles_by_id, cities_coords), best_fitness, gen)
         else:
             stagnation_counter += 1
         
         # Registrar histórico
-        if best_solution:
-            total_cost = sum(r.total_cost for r in best_solution if r.route)
-            total_distance = sum(r.total_distance for r in best_solution if r.route)
-            cost_history.append(total_cost)
-            distance_history.append(total_distance)
+        if best_snapshot is not None:
+            cost_history.append(best_snapshot.total_cost)
+            distance_history.append(best_snapshot.total_distance)
         
         # 3. Relatório periódico
         if gen % 20 == 0:
             print(f"   Viáveis: {feasible_count}/{POPULATION_SIZE} | Estagnação: {stagnation_counter}")
         
+        # Critérios de parada (tempo, gerações, avaliações, alvo, janela de melhora)
+        if termination.should_stop(gen + 1, evaluations, best_fitness):
+            print(f"🏁 Parando na geração {gen}: {termination.reason}")
+            break
+        
         # 4. Estratégia de escape se estagnado em inviáveis
         if stagnation_counter > 30 and not feasible_found:
             print(f"🔁 Reiniciando população (gen {gen})")
@@ -689,33 +986,47 @@ def solve_vrp(cities_coords, coord_to_city, deliveries_by_city,
             parent2 = tournament[1][1]
             
             # Cruzamento
-            child = adaptive_crossover(parent1, parent2, depot_coord, options, gen, generations_per_route)
+            child = adaptive_crossover(parent1, parent2, depot_coord, options, schedule_gen, generations_per_route)
             
             # Mutação especial
-            child = feasibility_mutation(child, depot_coord, options, gen,
-                                        coord_to_city, deliveries_by_city, distance_lookup)
+            child = feasibility_mutation(child, depot_coord, options, schedule_gen,
+                                        coord_to_city, deliveries_by_city, distance_lookup,
+                                        distance_matrix, city_index)
             
             new_population.append(child)
         
         population = new_population
     
+    evaluator.close()
+    
     # OTIMIZAÇÃO FINAL
     print("\n🔧 Fase final de otimização...")
     
-    if best_solution:
+    best_solution = None
+    if best_snapshot is not None:
+        best_solution = best_snapshot.materialize(vehicles_by_id, cities_coords)
+    
+    # time_limit vale até o fim: sem tempo restante, fica o melhor já encontrado
+    if best_solution and termination.remaining() == 0.0:
+        print("⏱️  Tempo esgotado: correções e ordenação final ignoradas")
+    elif best_solution:
         # Verificar viabilidade
         is_feasible = all(route.is_feasible for route in best_solution)
         
         if not is_feasible:
             print("⚠️  Aplicando correções de viabilidade...")
             best_solution = force_feasibility(best_solution, vehicles_sorted, depot_coord,
-                                            coord_to_city, deliveries_by_city, distance_lookup)
+                                            coord_to_city, deliveries_by_city, distance_lookup,
+                                            distance_matrix, city_index)
         
         # Otimizar ordem por prioridade
         for route in best_solution:
+            if termination.remaining() == 0.0:
+                break
             if route.route:
                 route.route = optimize_route_order(route.route, coord_to_city, deliveries_by_city)
-                route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup)
+                route.calculate_stats(coord_to_city, deliveries_by_city, distance_lookup,
+                                      distance_matrix, city_index)
     
     final_solution = [r for r in best_solution if r.route] if best_solution else []
     